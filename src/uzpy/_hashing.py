@@ -0,0 +1,78 @@
+# this_file: src/uzpy/_hashing.py
+
+"""
+File fingerprints shared by the parser and analyzer caches.
+
+Both caches decide whether a file changed in two steps: a cheap stat
+signature first, and a content hash only when the signature moved. This
+module holds those two primitives and the diskcache settings both caches
+open their stores with.
+"""
+
+import functools
+import hashlib
+import mmap
+from pathlib import Path
+from typing import Any
+
+# BLAKE3 is an optional speed-up for content fingerprints; without it the
+# stdlib BLAKE2b is used, which still outpaces MD5 on 64-bit machines.
+try:
+    from blake3 import blake3 as _new_content_hasher  # type: ignore[import-not-found]
+except ImportError:
+    _new_content_hasher = functools.partial(hashlib.blake2b, digest_size=16)
+
+# Read size used when hashing file contents (1 MiB)
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Files at least this large are hashed through mmap instead of read()
+_MMAP_THRESHOLD = 64 * 1024
+
+# SQLite tuning on top of diskcache's own defaults (WAL journal, synchronous=NORMAL,
+# highest pickle protocol): a 64 MiB page cache and a 256 MiB memory map, so hot
+# lookups are served from mapped pages instead of read() calls
+CACHE_SETTINGS: dict[str, Any] = {"sqlite_cache_size": 2**14, "sqlite_mmap_size": 2**28}
+
+
+def stat_signature(file_path: Path) -> tuple[int, int, int]:
+    """
+    Get a file's (mtime_ns, size, inode) signature.
+
+    Raises:
+        OSError: If the file cannot be stat-ed.
+
+    Used in:
+    - src/uzpy/analyzer/cached_analyzer.py
+    - src/uzpy/parser/cached_parser.py
+    """
+    stat = file_path.stat()
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def hash_file_content(file_path: Path, size: int) -> str:
+    """
+    Hash a file's content.
+
+    Args:
+        file_path: The file to hash.
+        size: The file's size in bytes, as taken from its signature.
+
+    Returns:
+        The hex digest of the content.
+
+    Used in:
+    - src/uzpy/analyzer/cached_analyzer.py
+    - src/uzpy/parser/cached_parser.py
+    """
+    hasher = _new_content_hasher()
+    with open(file_path, "rb", buffering=0) as f:
+        if size >= _MMAP_THRESHOLD:
+            # Hash large files straight from a read-only mapping, without copying
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        else:
+            # Read in large unbuffered chunks: typical source files take a single read()
+            while chunk := f.read(_HASH_CHUNK_SIZE):
+                hasher.update(chunk)
+    content_hash: str = hasher.hexdigest()
+    return content_hash
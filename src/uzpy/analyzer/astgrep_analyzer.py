@@ -14,6 +14,8 @@ from typing import Any
 
 from loguru import logger  # Moved logger import to the top
 
+from uzpy.analyzer.name_prefilter import find_files_mentioning
+
 # ast_grep_py ships no type stubs and its API has shifted across releases; the
 # whole import block below is a best-effort version-compatibility shim, so it is
 # exempted from strict typing rather than restructured.
@@ -135,12 +137,16 @@ class AstGrepAnalyzer:
         patterns_with_desc = self._get_ast_grep_patterns(construct)
 
         for file_path in search_paths:
-            if not file_path.is_file() or not file_path.exists():
+            # is_file() is False for missing paths too, so one stat covers both cases
+            if not file_path.is_file():
                 logger.warning(f"Skipping non-existent or non-file path: {file_path}")
                 continue
 
             try:
                 file_content = file_path.read_text(encoding="utf-8")
+                # A file that never mentions the name cannot match any pattern; skip the parse
+                if construct.name not in file_content:
+                    continue
                 sg_root = SgRoot(file_content, TreeSitterLang.Python)  # Use Python language
 
                 for item in patterns_with_desc:
@@ -182,8 +188,9 @@ class AstGrepAnalyzer:
     def analyze_batch(self, constructs: list[Construct], search_paths: list[Path]) -> dict[Construct, list[Reference]]:
         """
         Analyze a batch of constructs.
-        For ast-grep, this will call find_usages for each construct.
-        Batching source file parsing could be an optimization if ast-grep supports it directly.
+        For ast-grep, this will call find_usages for each construct, passing
+        only the search paths that mention the construct's name, so files
+        without any of the names are never parsed.
         """
         results: dict[Construct, list[Reference]] = {}
         if SgRoot is None:  # Guard if ast-grep is not available
@@ -191,8 +198,9 @@ class AstGrepAnalyzer:
                 results[construct] = []
             return results
 
+        candidate_paths = find_files_mentioning({c.name for c in constructs}, search_paths)
         for construct in constructs:
-            results[construct] = self.find_usages(construct, search_paths)
+            results[construct] = self.find_usages(construct, candidate_paths[construct.name])
         return results
 
     def __del__(self) -> None:
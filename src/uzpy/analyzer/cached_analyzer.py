@@ -16,6 +16,7 @@ from typing import Any
 import diskcache  # type: ignore[import-untyped]
 from loguru import logger
 
+from uzpy._hashing import CACHE_SETTINGS, hash_file_content, stat_signature
 from uzpy.types import Construct, Reference
 
 
@@ -47,13 +48,18 @@ class CachedAnalyzer:
         if cache_dir is None:
             cache_dir = Path.home() / ".uzpy" / "cache"
         self.cache_path = cache_dir / cache_name
-        self.cache = diskcache.Cache(str(self.cache_path))  # Ensure cache_path is string
+        self.cache = diskcache.Cache(str(self.cache_path), **CACHE_SETTINGS)  # Ensure cache_path is string
+        # Content hashes keyed by (mtime_ns, size, inode), so unchanged files are never re-read
+        self._stat_hash_cache: dict[Path, tuple[tuple[int, int, int], str]] = {}
         logger.info(f"CachedAnalyzer initialized. Cache location: {self.cache_path}")
 
     def _get_file_hash(self, file_path: Path) -> str:
         """
         Generate a hash for a file based on its content and modification time.
 
+        The content hash is only recomputed when the file's stat signature
+        (mtime, size, inode) changes since the last call.
+
         Args:
             file_path: The path to the file.
 
@@ -62,14 +68,15 @@ class CachedAnalyzer:
 
         """
         try:
-            stat = file_path.stat()
-            # Read file in chunks to handle large files efficiently
-            hasher = hashlib.md5()
-            with open(file_path, "rb") as f:
-                while chunk := f.read(8192):  # 8KB chunks
-                    hasher.update(chunk)
-            content_hash = hasher.hexdigest()
-            return f"{content_hash}-{stat.st_mtime_ns}"
+            stat_key = stat_signature(file_path)
+            cached = self._stat_hash_cache.get(file_path)
+            if cached is not None and cached[0] == stat_key:
+                return cached[1]
+
+            content_hash = hash_file_content(file_path, stat_key[1])
+            file_hash = f"{content_hash}-{stat_key[0]}"
+            self._stat_hash_cache[file_path] = (stat_key, file_hash)
+            return file_hash
         except FileNotFoundError:
             logger.warning(f"File not found for hashing: {file_path}")
             return f"nonexistent-{file_path.name}"  # Consistent hash for nonexistent files
@@ -0,0 +1,61 @@
+# this_file: src/uzpy/analyzer/name_prefilter.py
+
+"""
+Literal-name prefilter for reference search.
+
+A construct can only be referenced from a file whose text contains its name
+as an identifier. This module scans each reference file once, collects the
+identifier tokens it contains, and maps every requested name to the files
+that mention it. Analyzers can then hand each construct only its candidate
+files instead of the whole reference set.
+"""
+
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+from loguru import logger
+
+# Identifier tokens in raw source bytes. Bytes >= 0x80 are kept inside tokens so
+# non-ASCII (UTF-8 encoded) identifiers are not split apart.
+_IDENTIFIER_PATTERN = re.compile(rb"[A-Za-z_\x80-\xff][\w\x80-\xff]*")
+
+
+def find_files_mentioning(names: Iterable[str], files: list[Path]) -> dict[str, list[Path]]:
+    """
+    Map each name to the files that contain it as a whole identifier.
+
+    Every file is read and tokenized once, whatever the number of names, so
+    the cost is proportional to the total size of `files`. Files that cannot
+    be read are treated as mentioning every name, so nothing is filtered out
+    by mistake.
+
+    Args:
+        names: Identifiers to look for.
+        files: Files to scan.
+
+    Returns:
+        A dictionary with an entry for every name, listing the matching
+        files in the order of `files`.
+
+    Used in:
+    - src/uzpy/analyzer/astgrep_analyzer.py
+    - src/uzpy/analyzer/parallel_analyzer.py
+    - src/uzpy/pipeline.py
+    - tests/test_analyzer.py
+    """
+    wanted = {name.encode("utf-8"): name for name in names}
+    mentions: dict[str, list[Path]] = {name: [] for name in wanted.values()}
+
+    for file_path in files:
+        try:
+            data = file_path.read_bytes()
+        except OSError as e:
+            logger.debug(f"Could not read {file_path} for prefiltering, keeping it for all names: {e}")
+            for paths in mentions.values():
+                paths.append(file_path)
+            continue
+        for token in wanted.keys() & set(_IDENTIFIER_PATTERN.findall(data)):
+            mentions[wanted[token]].append(file_path)
+
+    return mentions
@@ -12,12 +12,13 @@ from child processes.
 
 import concurrent.futures
 import multiprocessing
-from dataclasses import replace
+import time
 from pathlib import Path
 from typing import Any  # Optional removed
 
 from loguru import logger
 
+from uzpy.analyzer.name_prefilter import find_files_mentioning
 from uzpy.types import Construct, Reference
 
 # multiprocessing-logging routes child-process logs back to the parent. It is an
@@ -32,6 +33,10 @@ except Exception as e:
     logger.debug(f"multiprocessing_logging not active ({e}); child-process logs may not be captured.")
 
 
+# Minimum number of seconds between two progress log lines during parallel analysis
+_PROGRESS_LOG_INTERVAL = 1.0
+
+
 # Helper function to be executed in parallel.
 # It needs to be a top-level function for pickling by multiprocessing.
 def _analyze_construct_worker(
@@ -110,46 +115,67 @@ class ParallelAnalyzer:
             logger.debug("analyze_batch called with no constructs.")
             return {}
 
+        results: dict[Construct, list[Reference]] = {}
+
+        # Give each construct only the search paths that mention its name. Constructs
+        # whose name appears nowhere cannot have references and are never analyzed.
+        candidate_paths = find_files_mentioning({c.name for c in constructs}, search_paths)
+        to_analyze = []
+        for c in constructs:
+            if candidate_paths[c.name]:
+                to_analyze.append(c)
+            else:
+                results[c] = []
+        logger.debug(f"Name prefilter left {len(to_analyze)}/{len(constructs)} constructs to analyze.")
+        if not to_analyze:
+            return results
+
         # If batch size is too small or parallelism is disabled, run sequentially.
-        if len(constructs) < self.num_workers or self.num_workers <= 1:
+        if len(to_analyze) < self.num_workers or self.num_workers <= 1:
             logger.info(
-                f"Batch size ({len(constructs)}) is less than num_workers ({self.num_workers}), "
+                f"Batch size ({len(to_analyze)}) is less than num_workers ({self.num_workers}), "
                 f"or num_workers is 1. Running sequentially."
             )
             # Check if the underlying analyzer has its own batch processing
             if hasattr(self.analyzer, "analyze_batch") and callable(self.analyzer.analyze_batch):
-                return self.analyzer.analyze_batch(constructs, search_paths)  # type: ignore[no-any-return]  # self.analyzer is Any (duck-typed)
+                # Batch together the constructs that share candidate paths, so the wrapped
+                # analyzer sees the same narrowed paths as the process-pool path
+                groups: dict[tuple[Path, ...], list[Construct]] = {}
+                for c in to_analyze:
+                    groups.setdefault(tuple(candidate_paths[c.name]), []).append(c)
+                for paths, group in groups.items():
+                    results.update(self.analyzer.analyze_batch(group, list(paths)))
+                return results
             # Fallback to individual calls if no batch method on wrapped analyzer
-            results_sequential = {}
-            for construct_item in constructs:
+            for construct_item in to_analyze:
                 if hasattr(self.analyzer, "find_usages") and callable(self.analyzer.find_usages):
-                    results_sequential[construct_item] = self.analyzer.find_usages(construct_item, search_paths)
+                    results[construct_item] = self.analyzer.find_usages(
+                        construct_item, candidate_paths[construct_item.name]
+                    )
                 else:
                     logger.error(f"Wrapped analyzer {type(self.analyzer)} has no find_usages method.")
-                    results_sequential[construct_item] = []
-            return results_sequential
-
-        logger.info(f"Starting parallel analysis of {len(constructs)} constructs using {self.num_workers} workers.")
+                    results[construct_item] = []
+            return results
 
-        results: dict[Construct, list[Reference]] = {}
+        logger.info(f"Starting parallel analysis of {len(to_analyze)} constructs using {self.num_workers} workers.")
 
         # Using ProcessPoolExecutor for managing the process pool.
         # The context manager ensures the pool is properly shut down.
         with concurrent.futures.ProcessPoolExecutor(max_workers=self.num_workers) as executor:
-            # Tree-sitter Node objects are not picklable, so submit a copy with
-            # the node stripped while keying each future on the original construct
-            # (which still carries the node) for the result mapping below.
+            # Constructs pickle without their tree-sitter node, so they can be
+            # submitted as they are; each future is keyed on the original construct
             futures_map = {
-                executor.submit(
-                    _analyze_construct_worker,
-                    self.analyzer,
-                    replace(c, node=None) if c.node is not None else c,
-                    search_paths,
-                ): c
-                for c in constructs
+                executor.submit(_analyze_construct_worker, self.analyzer, c, candidate_paths[c.name]): c
+                for c in to_analyze
             }
 
-            for future in concurrent.futures.as_completed(futures_map):
+            # Report progress at most once per interval, not once per construct
+            last_progress_log = time.monotonic()
+            for completed, future in enumerate(concurrent.futures.as_completed(futures_map), 1):
+                now = time.monotonic()
+                if now - last_progress_log >= _PROGRESS_LOG_INTERVAL:
+                    logger.info(f"Analyzed {completed}/{len(futures_map)} constructs...")
+                    last_progress_log = now
                 original_construct = futures_map[future]
                 try:
                     # future.result() will raise an exception if the worker failed.
@@ -33,7 +33,7 @@ from uzpy.modifier import LibCSTCleaner
 from uzpy.parser import CachedParser, TreeSitterParser  # Ensure CachedParser is also imported
 
 # Assuming other necessary uzpy components will be imported as needed
-from uzpy.pipeline import run_analysis_and_modification
+from uzpy.pipeline import create_modifier, run_analysis_and_modification
 
 # Placeholder for watcher, will be implemented in a later step
 # from uzpy.watcher import UzpyWatcher
@@ -221,11 +221,14 @@ def run(
         None, "--ref", "-r", help="Reference path for usage search (overrides config).", resolve_path=True
     ),
     dry_run: bool = typer.Option(False, "--dry-run", help="Show changes without modifying files."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-parse every file instead of using the parser cache."),
 ) -> None:
     """
     Analyze codebase and update docstrings with usage information.
     """
     settings: UzpySettings = ctx.meta["settings"]
+    if no_cache:  # CLI --no-cache overrides .env
+        settings.use_cache = False
 
     # Override paths from CLI if provided
     current_edit_path = edit_path_override if edit_path_override else settings.edit_path
@@ -242,7 +245,7 @@ def run(
     if dry_run:
         console.print("[yellow]DRY RUN MODE[/yellow] - no files will be modified.")
 
-    _parser, analyzer = _get_analyzer_stack(settings)  # Parser is used inside pipeline
+    parser, analyzer = _get_analyzer_stack(settings)  # Parser is used inside pipeline
 
     try:
         # Note: The `run_analysis_and_modification` function in `pipeline.py`
@@ -258,9 +261,9 @@ def run(
             ref_path=current_ref_path,
             exclude_patterns=settings.exclude_patterns,
             dry_run=dry_run,
-            # We might need to pass the configured analyzer and parser instances here
-            # For example: parser_instance=_parser, analyzer_instance=analyzer
-            # This requires run_analysis_and_modification to be adapted.
+            # The configured parser carries the on-disk parse cache (unless disabled),
+            # so unchanged files are not re-parsed between runs
+            parser_instance=parser,
         )
         total_constructs = len(usage_results)
         constructs_with_refs = sum(1 for refs in usage_results.values() if refs)
@@ -415,6 +418,13 @@ def watch(
     # This is where the Watchdog integration would go.
     from uzpy.watcher import WatcherOrchestrator  # Assuming this will be created
 
+    # Every run uses this mode, and the shared modifier below is built for it
+    safe_mode = False
+
+    # One modifier per (ref path, safe_mode) for the whole watch session, so its
+    # reference path cache is not rebuilt for every change
+    modifiers: dict[tuple[Path, bool], Any] = {}
+
     def _on_files_changed_callback(changed_files: set[Path]) -> None:
         console.print("\n[bold magenta]File change detected for:[/bold magenta]")
         for f_path in changed_files:
@@ -442,15 +452,23 @@ def watch(
             current_ref_path = settings.get_effective_ref_path()
 
             console.print(f"Re-analyzing '[cyan]{current_edit_path}[/cyan]'...")
-            _parser, analyzer = _get_analyzer_stack(settings)
+            parser, analyzer = _get_analyzer_stack(settings)
+
+            modifier_key = (current_ref_path, safe_mode)
+            if modifier_key not in modifiers:
+                # The reference path changed (or this is the first run): start a new modifier
+                modifiers.clear()
+                modifiers[modifier_key] = create_modifier(current_ref_path, safe_mode)
 
             usage_results = run_analysis_and_modification(
                 edit_path=current_edit_path,
                 ref_path=current_ref_path,
                 exclude_patterns=settings.exclude_patterns,
                 dry_run=False,  # Watch mode typically applies changes
-                # parser_instance=_parser, # If pipeline supports this
+                safe_mode=safe_mode,
+                parser_instance=parser,  # Cached parser: only changed files are re-parsed
                 # analyzer_instance=analyzer # If pipeline supports this
+                modifier_instance=modifiers[modifier_key],
             )
             total_constructs = len(usage_results)
             constructs_with_refs = sum(1 for refs in usage_results.values() if refs)
@@ -10,12 +10,47 @@ Used in:
 - discovery.py
 """
 
-from collections.abc import Iterator
+import os
+import re
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import ClassVar
 
 import pathspec
 from loguru import logger
+from pathspec.util import normalize_file
+
+
+def compile_exclude_matcher(spec: pathspec.PathSpec) -> Callable[[str], bool]:
+    """
+    Build a fast predicate equivalent to `spec.match_file`.
+
+    PathSpec tries its patterns one by one. When none of them is a negation
+    ("!pattern"), the order does not matter and any match excludes, so the
+    patterns are fused into one regular expression that is matched once per
+    path. Specs with negations keep PathSpec's own last-match-wins logic.
+
+    Args:
+        spec: A compiled gitwildmatch PathSpec
+
+    Returns:
+        A function telling whether a path string is matched by the spec
+
+    Used in:
+    - discovery.py
+    - watcher.py
+    """
+    patterns = [pattern for pattern in spec.patterns if pattern.include is not None]
+    if any(not pattern.include for pattern in patterns) or not all(
+        isinstance(pattern, pathspec.patterns.GitWildMatchPattern) for pattern in patterns
+    ):
+        return spec.match_file
+    if not patterns:
+        return lambda _path: False
+
+    # Each pattern names a group ps_d; names must be unique, so make them plain groups
+    fused = re.compile("|".join(f"(?:{pattern.regex.pattern})" for pattern in patterns).replace("(?P<ps_d>", "(?:"))
+    return lambda path: fused.match(normalize_file(path)) is not None
 
 
 class FileDiscovery:
@@ -72,7 +107,9 @@ class FileDiscovery:
 
         # Compile pathspec for efficient matching
         self.spec = pathspec.PathSpec.from_lines("gitwildmatch", self.exclude_patterns)
+        self._matches_exclude = compile_exclude_matcher(self.spec)
         self.root_path: Path | None = None  # Will be set during find_python_files
+        self._scan_root: Path | None = None  # root_path as given, for syscall-free relative paths
         logger.debug(f"Initialized with {len(self.exclude_patterns)} exclude patterns")
 
     def find_python_files(self, root_path: Path) -> Iterator[Path]:
@@ -106,6 +143,7 @@ class FileDiscovery:
 
         # Set root path for relative path calculations
         self.root_path = root_path.resolve()
+        self._scan_root = root_path
 
         # Handle single file case
         if root_path.is_file():
@@ -143,12 +181,17 @@ class FileDiscovery:
         - discovery.py
         """
         try:
-            for item in root_path.iterdir():
-                if item.is_file():
-                    yield item
-                elif item.is_dir() and not self._is_excluded(item):
-                    # Recursively walk subdirectories
-                    yield from self._walk_directory(item)
+            # scandir reports entry types from the directory listing itself, so
+            # the file/directory checks below need no stat() call per entry
+            with os.scandir(root_path) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        yield root_path / entry.name
+                    elif entry.is_dir():
+                        item = root_path / entry.name
+                        if not self._is_excluded(item):
+                            # Recursively walk subdirectories
+                            yield from self._walk_directory(item)
         except PermissionError:
             logger.warning(f"Permission denied accessing directory: {root_path}")
         except OSError as e:
@@ -197,6 +240,15 @@ class FileDiscovery:
         """
         # Convert to relative path for pattern matching
         try:
+            if self._scan_root is not None:
+                # Paths found by walking the scan root are relative to it as
+                # written, which needs no resolve() (one lstat per component)
+                try:
+                    relative_path = path.relative_to(self._scan_root)
+                except ValueError:
+                    pass
+                else:
+                    return self._matches_exclude(str(relative_path).replace("\\", "/"))
             if self.root_path:
                 # Use relative path from root for pattern matching
                 try:
@@ -209,7 +261,7 @@ class FileDiscovery:
                 # Fallback to absolute path
                 path_str = str(path).replace("\\", "/")
 
-            return self.spec.match_file(path_str)
+            return self._matches_exclude(path_str)
         except Exception as e:
             logger.debug(f"Error checking exclusion for {path}: {e}")
             return False
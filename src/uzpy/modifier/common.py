@@ -0,0 +1,219 @@
+# this_file: src/uzpy/modifier/common.py
+
+"""
+Helpers shared by the LibCST and safe docstring modifiers.
+
+Both modifiers must write identical "Used in:" entries for the same
+references, so switching between them never rewrites a docstring. They
+also read, group and batch files the same way, through the helpers below.
+"""
+
+import concurrent.futures
+import functools
+import mmap
+import os
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any, TypeVar
+
+from loguru import logger
+
+from uzpy.types import Construct, Reference
+
+_T = TypeVar("_T")
+
+# Files at least this large are read through mmap instead of a buffered read
+_MMAP_THRESHOLD = 64 * 1024
+
+# Below this many files, batches are processed in-process; a process pool costs more to start
+_PARALLEL_MIN_FILES = 8
+
+# Upper bound on the files sent to a worker process per task
+_CHUNK_SIZE = 20
+
+# Modifier of a worker process, created once by _init_worker
+_worker_modifier: Any = None
+
+
+def read_source(file_path: Path) -> str:
+    """
+    Read a Python source file as text with universal newlines.
+
+    Large files are mapped into memory and decoded straight from the mapping,
+    which saves the extra buffer copy a regular read makes.
+
+    Used in:
+    - src/uzpy/modifier/libcst_modifier.py
+    - src/uzpy/modifier/safe_modifier.py
+    """
+    with open(file_path, "rb") as f:
+        size = f.seek(0, 2)
+        if size < _MMAP_THRESHOLD:
+            f.seek(0)
+            text = f.read().decode("utf-8")
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, "utf-8")
+
+    # Match text-mode open(): translate \r\n and lone \r to \n
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def write_source(file_path: Path, code: str) -> None:
+    """
+    Write Python source text back to a file as UTF-8.
+
+    Used in:
+    - src/uzpy/modifier/libcst_modifier.py
+    - src/uzpy/modifier/safe_modifier.py
+    """
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(code)
+
+
+def group_by_file(
+    usage_results: dict[Construct, list[Reference]],
+) -> dict[Path, dict[Construct, list[Reference]]]:
+    """
+    Split usage results into one usage map per defining file.
+
+    Constructs without references are dropped, since there is nothing to
+    record for them.
+
+    Used in:
+    - src/uzpy/modifier/libcst_modifier.py
+    - src/uzpy/modifier/safe_modifier.py
+    """
+    file_constructs: dict[Path, dict[Construct, list[Reference]]] = {}
+
+    logger.debug(f"Processing {len(usage_results)} constructs for modification")
+
+    for construct, references in usage_results.items():
+        if not references:  # Skip constructs with no references
+            logger.debug(f"Skipping {construct.name} - no references")
+            continue
+
+        file_path = construct.file_path
+        if file_path not in file_constructs:
+            file_constructs[file_path] = {}
+        file_constructs[file_path][construct] = references
+        logger.debug(f"Will modify {construct.name} in {file_path} ({len(references)} references)")
+
+    logger.info(f"Will modify {len(file_constructs)} files")
+    return file_constructs
+
+
+def _init_worker(modifier_type: type, project_root: Path) -> None:
+    """Create the modifier a worker process reuses for all of its chunks."""
+    global _worker_modifier
+    _worker_modifier = modifier_type(project_root)
+
+
+def _run_chunk(
+    task: Callable[[Any, Path, dict[Construct, list[Reference]]], _T],
+    items: list[tuple[Path, dict[Construct, list[Reference]]]],
+) -> list[tuple[Path, _T]]:
+    """Run `task` on a chunk of files in a worker process, returning (path, result) pairs."""
+    return [(file_path, task(_worker_modifier, file_path, construct_map)) for file_path, construct_map in items]
+
+
+def process_files(
+    modifier: Any,
+    items: list[tuple[Path, dict[Construct, list[Reference]]]],
+    task: Callable[[Any, Path, dict[Construct, list[Reference]]], _T],
+    num_workers: int | None = None,
+) -> Iterator[tuple[Path, _T]]:
+    """
+    Run `task(modifier, file_path, usage_map)` on every file, spreading large batches over a process pool.
+
+    Each worker process builds its own modifier of the same type once, from
+    `modifier.project_root`, and reuses it for all of its chunks. `task`
+    must therefore be picklable, such as a plain method of the modifier
+    class or a functools.partial of one.
+
+    Args:
+        modifier: The modifier used in-process; its type and project root seed the workers.
+        items: (file path, usage map) pairs, as produced by group_by_file.
+        task: Work to do per file.
+        num_workers: Number of worker processes. Defaults to the CPU count.
+
+    Yields:
+        (path, result) pairs in the order of `items`.
+
+    Used in:
+    - src/uzpy/modifier/libcst_modifier.py
+    - src/uzpy/modifier/safe_modifier.py
+    """
+    workers = num_workers if num_workers is not None else (os.cpu_count() or 1)
+    if len(items) < _PARALLEL_MIN_FILES or workers <= 1:
+        for file_path, construct_map in items:
+            yield file_path, task(modifier, file_path, construct_map)
+        return
+
+    # LibCST parsing and code generation are CPU-bound, so threads would serialize on the GIL
+    chunk_size = min(_CHUNK_SIZE, -(-len(items) // workers))
+    chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+    logger.info(f"Processing {len(items)} files with {min(workers, len(chunks))} worker(s)")
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        initializer=_init_worker,
+        initargs=(type(modifier), modifier.project_root),
+    ) as executor:
+        for chunk_results in executor.map(functools.partial(_run_chunk, task), chunks):
+            yield from chunk_results
+
+
+def reference_display_paths(
+    references: list[Reference],
+    *,
+    project_root: Path,
+    resolved_root: Path,
+    resolved_current_file: Path | None,
+    path_cache: dict[Path, tuple[Path, str]],
+) -> set[str]:
+    """
+    Get the "Used in:" display paths of the files referencing a construct.
+
+    References from the file being modified are left out. Each reference
+    file is resolved and made relative to the project root only once;
+    later references into the same file reuse the entry in `path_cache`.
+    Paths use forward slashes on every platform.
+
+    Args:
+        references: The construct's references.
+        project_root: Root directory of the project, as given.
+        resolved_root: `project_root`, resolved.
+        resolved_current_file: The resolved file being modified, if any.
+        path_cache: Resolved path and display string per reference file.
+
+    Returns:
+        The display paths, relative to the project root where possible.
+
+    Used in:
+    - src/uzpy/modifier/libcst_modifier.py
+    - src/uzpy/modifier/safe_modifier.py
+    """
+    paths = set()
+    for ref in references:
+        cached = path_cache.get(ref.file_path)
+        if cached is None:
+            resolved_file = ref.file_path.resolve()
+            try:
+                rel_path = resolved_file.relative_to(resolved_root)
+            except ValueError:
+                # If can't make relative, try with the original paths
+                try:
+                    rel_path = ref.file_path.relative_to(project_root)
+                except ValueError:
+                    # If still can't make relative, use the path as given
+                    rel_path = ref.file_path
+            cached = (resolved_file, rel_path.as_posix())
+            path_cache[ref.file_path] = cached
+
+        # Skip references to the same file being modified
+        if cached[0] == resolved_current_file:
+            continue
+        paths.add(cached[1])
+    return paths
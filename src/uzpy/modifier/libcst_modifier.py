@@ -10,6 +10,8 @@ Used in:
 - modifier/libcst_modifier.py
 """
 
+import concurrent.futures
+import functools
 import re
 from pathlib import Path
 
@@ -17,8 +19,24 @@ import libcst as cst
 from libcst import SimpleString
 from loguru import logger
 
+from uzpy.modifier.common import group_by_file, process_files, read_source, reference_display_paths, write_source
 from uzpy.types import Construct, Reference
 
+# Threads that write modified files back while modify_files transforms the next ones
+_WRITE_WORKERS = 4
+
+# Parsed modules kept per source text; CST nodes are immutable, so a cached module can be visited again
+_PARSE_CACHE_SIZE = 64
+
+# "Used in:" section of a docstring: the line break and indent before it, then the heading and its entries
+_USED_IN_SECTION = re.compile(r"(\n\s*)(Used in:(?:\s*\n(?:\s*-\s*[^\n]+\n?)*)\s*)", re.MULTILINE | re.DOTALL)
+
+# Indentation in front of the "Used in:" heading
+_USED_IN_INDENT = re.compile(r"\n\n?(\s*)Used in:")
+
+# One "- path" entry of a "Used in:" section
+_USED_IN_ENTRY = re.compile(r"\s*-\s*(.+?)(?:\n|$)")
+
 
 def _strip_docstring_quotes(docstring: str) -> str:
     """Return the inner text of a docstring literal, without its quote delimiters.
@@ -33,6 +51,17 @@ def _strip_docstring_quotes(docstring: str) -> str:
     return docstring
 
 
+def _has_updates_for(file_path: Path, usage_map: dict[Construct, list[Reference]]) -> bool:
+    """
+    Check whether any construct of `file_path` has references to record.
+
+    DocstringModifier only touches constructs defined in the current file
+    that have at least one reference, so without one the file can be left
+    unparsed.
+    """
+    return any(references and construct.file_path == file_path for construct, references in usage_map.items())
+
+
 class DocstringModifier(cst.CSTTransformer):
     """
     LibCST transformer for updating docstrings with usage information.
@@ -48,13 +77,20 @@ class DocstringModifier(cst.CSTTransformer):
     - uzpy/modifier/__init__.py
     """
 
-    def __init__(self, usage_map: dict[Construct, list[Reference]], project_root: Path):
+    def __init__(
+        self,
+        usage_map: dict[Construct, list[Reference]],
+        project_root: Path,
+        path_cache: dict[Path, tuple[Path, str]] | None = None,
+    ):
         """
         Initialize the docstring modifier.
 
         Args:
             usage_map: Mapping of constructs to their usage references
             project_root: Root directory of the project for relative paths
+            path_cache: Resolved path and display string per reference file;
+                pass the same dict to modifiers for other files to share it
 
         Used in:
         - modifier/libcst_modifier.py
@@ -62,6 +98,9 @@ class DocstringModifier(cst.CSTTransformer):
         self.usage_map = usage_map
         self.project_root = project_root
         self.current_file: Path | None = None
+        self._resolved_root = project_root.resolve()
+        self._resolved_current_file: Path | None = None
+        self._path_cache = path_cache if path_cache is not None else {}
 
         # Build lookup map for faster access
         self.construct_lookup: dict[Path, dict[str, Construct]] = {}
@@ -80,6 +119,7 @@ class DocstringModifier(cst.CSTTransformer):
         - modifier/libcst_modifier.py
         """
         self.current_file = file_path
+        self._resolved_current_file = file_path.resolve()
 
     def leave_FunctionDef(self, original_node: cst.FunctionDef, updated_node: cst.FunctionDef) -> cst.FunctionDef:
         """Update function docstrings with usage information.
@@ -252,35 +292,16 @@ class DocstringModifier(cst.CSTTransformer):
             base_indent = original_indent
 
         # Convert new references to relative paths, excluding same-file references
-        new_paths = set()
-        for ref in references:
-            # Skip references to the same file being modified
-            if self.current_file and ref.file_path.resolve() == self.current_file.resolve():
-                continue
-
-            try:
-                # Resolve both paths to ensure proper comparison
-                resolved_file = ref.file_path.resolve()
-                resolved_root = self.project_root.resolve()
-                rel_path = resolved_file.relative_to(resolved_root)
-            except ValueError:
-                # If can't make relative, try with the original paths
-                try:
-                    rel_path = ref.file_path.relative_to(self.project_root)
-                except ValueError:
-                    # If still can't make relative, use the file name only
-                    rel_path = ref.file_path
-            new_paths.add(str(rel_path))
+        new_paths = self._reference_paths(references)
 
         # Merge existing and new paths
         all_paths = existing_paths | new_paths
 
         # Generate usage section with merged paths
         if all_paths:
-            usage_lines = []
-            for path in sorted(all_paths):
-                usage_lines.append(f"{base_indent}- {path}")
-            usage_section = f"{base_indent}Used in:\n" + "\n".join(usage_lines) + "\n"
+            line_prefix = f"{base_indent}- "
+            usage_lines = "\n".join(line_prefix + path for path in sorted(all_paths))
+            usage_section = f"{base_indent}Used in:\n{usage_lines}\n"
         else:
             usage_section = ""
 
@@ -304,16 +325,17 @@ class DocstringModifier(cst.CSTTransformer):
         Used in:
         - tests/test_modifier.py
         """
-        # Pattern to match "Used in:" section with paths
-        pattern = r"(\n\s*)(Used in:(?:\s*\n(?:\s*-\s*[^\n]+\n?)*)\s*)"
+        # Most docstrings have no section yet; a substring test rules that out without running the regex
+        if "Used in:" not in content:
+            return content, set(), ""
 
-        match = re.search(pattern, content, re.MULTILINE | re.DOTALL)
+        match = _USED_IN_SECTION.search(content)
         if not match:
             return content, set(), ""
 
         # Extract indentation from the "Used in:" line (look for immediate indentation before "Used in:")
         # Match a newline, then optionally another newline, then capture spaces/tabs before "Used in:"
-        indent_match = re.search(r"\n\n?(\s*)Used in:", content)
+        indent_match = _USED_IN_INDENT.search(content)
         # Extract just the spaces/tabs, not including newlines
         original_indent = indent_match.group(1) if indent_match else ""
 
@@ -322,17 +344,30 @@ class DocstringModifier(cst.CSTTransformer):
         usage_section = match.group(2)
 
         # Find all paths in the usage section (lines starting with -)
-        path_pattern = r"\s*-\s*(.+?)(?:\n|$)"
-        for path_match in re.finditer(path_pattern, usage_section):
+        for path_match in _USED_IN_ENTRY.finditer(usage_section):
             path = path_match.group(1).strip()
             if path:
                 existing_paths.add(path)
 
         # Remove the entire "Used in:" section from content
-        cleaned_content = re.sub(pattern, "", content, flags=re.MULTILINE | re.DOTALL)
+        cleaned_content = _USED_IN_SECTION.sub("", content)
 
         return cleaned_content, existing_paths, original_indent
 
+    def _reference_paths(self, references: list[Reference]) -> set[str]:
+        """Get the display paths of the files referencing a construct, leaving out the current file.
+
+        Used in:
+        - modifier/libcst_modifier.py
+        """
+        return reference_display_paths(
+            references,
+            project_root=self.project_root,
+            resolved_root=self._resolved_root,
+            resolved_current_file=self._resolved_current_file,
+            path_cache=self._path_cache,
+        )
+
     def _create_new_docstring(self, references: list[Reference]) -> str:
         """Create a new docstring with usage information.
 
@@ -344,32 +379,13 @@ class DocstringModifier(cst.CSTTransformer):
         base_indent = "    "
 
         # Convert references to relative paths, excluding same-file references
-        relative_paths = set()
-        for ref in references:
-            # Skip references to the same file being modified
-            if self.current_file and ref.file_path.resolve() == self.current_file.resolve():
-                continue
-
-            try:
-                # Resolve both paths to ensure proper comparison
-                resolved_file = ref.file_path.resolve()
-                resolved_root = self.project_root.resolve()
-                rel_path = resolved_file.relative_to(resolved_root)
-            except ValueError:
-                # If can't make relative, try with the original paths
-                try:
-                    rel_path = ref.file_path.relative_to(self.project_root)
-                except ValueError:
-                    # If still can't make relative, use the file name only
-                    rel_path = ref.file_path
-            relative_paths.add(str(rel_path))
+        relative_paths = self._reference_paths(references)
 
         # Generate usage section
         if relative_paths:
-            usage_lines = []
-            for path in sorted(relative_paths):
-                usage_lines.append(f"{base_indent}- {path}")
-            usage_section = f"{base_indent}Used in:\n" + "\n".join(usage_lines) + "\n"
+            line_prefix = f"{base_indent}- "
+            usage_lines = "\n".join(line_prefix + path for path in sorted(relative_paths))
+            usage_section = f"{base_indent}Used in:\n{usage_lines}\n"
         else:
             usage_section = ""
 
@@ -442,6 +458,11 @@ class LibCSTModifier:
         - modifier/libcst_modifier.py
         """
         self.project_root = project_root
+        # Resolved path and display string per reference file, shared by all files modified
+        self._path_cache: dict[Path, tuple[Path, str]] = {}
+        # Identical sources are parsed once; modify_files empties this when it finishes,
+        # so a long-lived modifier (watch mode) keeps no sources or trees between batches
+        self._parse_module = functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)(cst.parse_module)
 
     def modify_file(self, file_path: Path, usage_map: dict[Construct, list[Reference]]) -> bool:
         """
@@ -459,26 +480,12 @@ class LibCSTModifier:
         - tests/test_modifier.py
         """
         try:
-            # Read the source code
-            with open(file_path, encoding="utf-8") as f:
-                source_code = f.read()
-
-            # Parse with LibCST
-            tree = cst.parse_module(source_code)
-
-            # Transform the tree
-            modifier = DocstringModifier(usage_map, self.project_root)
-            modifier.set_current_file(file_path)
-            modified_tree = tree.visit(modifier)
-
-            # Check if any changes were made
-            if modified_tree.code == source_code:
-                logger.debug(f"No changes needed for {file_path}")
+            modified_code = self._render_file(file_path, usage_map)
+            if modified_code is None:
                 return False
 
             # Write back the modified code
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(modified_tree.code)
+            write_source(file_path, modified_code)
 
             logger.info(f"Updated docstrings in {file_path}")
             return True
@@ -487,6 +494,58 @@ class LibCSTModifier:
             logger.error(f"Failed to modify {file_path}: {e}")
             return False
 
+    def _render_file(self, file_path: Path, usage_map: dict[Construct, list[Reference]]) -> str | None:
+        """
+        Compute a file's modified source without writing it.
+
+        Args:
+            file_path: Path to the Python file to transform
+            usage_map: Mapping of constructs to their usage references
+
+        Returns:
+            The modified source, or None if no changes are needed
+
+        Used in:
+        - modifier/libcst_modifier.py
+        """
+        if not _has_updates_for(file_path, usage_map):
+            logger.debug(f"No referenced constructs in {file_path}, skipping")
+            return None
+
+        # Read the source code
+        source_code = read_source(file_path)
+
+        # Parse with LibCST
+        tree = self._parse_module(source_code)
+
+        # Transform the tree
+        modifier = DocstringModifier(usage_map, self.project_root, self._path_cache)
+        modifier.set_current_file(file_path)
+        modified_tree = tree.visit(modifier)
+
+        # Generating code walks the whole tree, so do it once
+        modified_code = modified_tree.code
+
+        # Check if any changes were made
+        if modified_code == source_code:
+            logger.debug(f"No changes needed for {file_path}")
+            return None
+        return modified_code
+
+    def _try_render(self, file_path: Path, usage_map: dict[Construct, list[Reference]]) -> str | None:
+        """
+        Like `_render_file`, but log failures and return None for them.
+
+        Used in:
+        - modifier/libcst_modifier.py
+        """
+        logger.debug(f"Modifying {file_path} with {len(usage_map)} constructs")
+        try:
+            return self._render_file(file_path, usage_map)
+        except Exception as e:
+            logger.error(f"Failed to modify {file_path}: {e}")
+            return None
+
     def modify_string(
         self,
         source_code: str,
@@ -510,21 +569,28 @@ class LibCSTModifier:
         Returns:
             The transformed source, or the original source on failure.
         """
+        if not _has_updates_for(file_path, usage_map):
+            return source_code
         try:
-            tree = cst.parse_module(source_code)
-            modifier = DocstringModifier(usage_map, self.project_root)
+            tree = self._parse_module(source_code)
+            modifier = DocstringModifier(usage_map, self.project_root, self._path_cache)
             modifier.set_current_file(file_path)
             return tree.visit(modifier).code
         except Exception as e:
             logger.error(f"Failed to modify source for {file_path}: {e}")
             return source_code
 
-    def modify_files(self, usage_results: dict[Construct, list[Reference]]) -> dict[str, bool]:
+    def modify_files(
+        self, usage_results: dict[Construct, list[Reference]], num_workers: int | None = None
+    ) -> dict[str, bool]:
         """
         Modify multiple files based on usage results.
 
+        Large batches are transformed in worker processes; small ones in-process.
+
         Args:
             usage_results: Results from reference analysis
+            num_workers: Number of worker processes. Defaults to the CPU count.
 
         Returns:
             Dictionary mapping file paths to success status
@@ -538,30 +604,33 @@ class LibCSTModifier:
         - uzpy/cli.py
         - uzpy/pipeline.py
         """
-        # Group constructs by file
-        file_constructs: dict[Path, dict[Construct, list[Reference]]] = {}
-
-        logger.debug(f"Processing {len(usage_results)} constructs for modification")
-
-        for construct, references in usage_results.items():
-            if not references:  # Skip constructs with no references
-                logger.debug(f"Skipping {construct.name} - no references")
-                continue
-
-            file_path = construct.file_path
-            if file_path not in file_constructs:
-                file_constructs[file_path] = {}
-            file_constructs[file_path][construct] = references
-            logger.debug(f"Will modify {construct.name} in {file_path} ({len(references)} references)")
-
-        logger.info(f"Will modify {len(file_constructs)} files")
-
-        # Modify each file
-        results = {}
-        for file_path, construct_map in file_constructs.items():
-            logger.debug(f"Modifying {file_path} with {len(construct_map)} constructs")
-            success = self.modify_file(file_path, construct_map)
-            results[str(file_path)] = success
+        # Each batch starts from fresh paths: files may have moved since the last one
+        self._path_cache.clear()
+        file_constructs = group_by_file(usage_results)
+
+        # Writes go to a thread pool so that disk latency overlaps with
+        # transforming the next files
+        results: dict[str, bool] = {str(file_path): False for file_path in file_constructs}
+        pending: dict[concurrent.futures.Future[None], Path] = {}
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=_WRITE_WORKERS) as executor:
+                for file_path, modified_code in process_files(
+                    self, list(file_constructs.items()), LibCSTModifier._try_render, num_workers
+                ):
+                    if modified_code is not None:
+                        pending[executor.submit(write_source, file_path, modified_code)] = file_path
+
+                for future in concurrent.futures.as_completed(pending):
+                    file_path = pending[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to modify {file_path}: {e}")
+                        continue
+                    logger.info(f"Updated docstrings in {file_path}")
+                    results[str(file_path)] = True
+        finally:
+            self._parse_module.cache_clear()
 
         return results
 
@@ -654,9 +723,8 @@ class DocstringCleaner(cst.CSTTransformer):
         # Strip whichever quote style the original docstring used.
         content = _strip_docstring_quotes(current_docstring)
 
-        # Use the same pattern as in DocstringModifier to remove "Used in:" sections
-        pattern = r"(\n\s*)(Used in:(?:\s*\n(?:\s*-\s*[^\n]+\n?)*)\s*)"
-        cleaned_content = re.sub(pattern, "", content, flags=re.MULTILINE | re.DOTALL)
+        # Use the same pattern as DocstringModifier to remove "Used in:" sections
+        cleaned_content = _USED_IN_SECTION.sub("", content) if "Used in:" in content else content
 
         # Clean up any trailing whitespace
         cleaned_content = cleaned_content.rstrip()
@@ -723,8 +791,7 @@ class LibCSTCleaner:
         """
         try:
             # Read the source code
-            with open(file_path, encoding="utf-8") as f:
-                source_code = f.read()
+            source_code = read_source(file_path)
 
             # Parse with LibCST
             tree = cst.parse_module(source_code)
@@ -8,6 +8,7 @@ LibCST modifier, including proper quote handling and syntax validation.
 """
 
 import ast
+import functools
 import re
 import shutil
 from pathlib import Path
@@ -16,6 +17,7 @@ import libcst as cst
 from libcst import SimpleString
 from loguru import logger
 
+from uzpy.modifier.common import group_by_file, process_files, read_source, reference_display_paths, write_source
 from uzpy.types import Construct, Reference
 
 
@@ -27,11 +29,28 @@ class SafeDocstringModifier(cst.CSTTransformer):
     that docstring modifications don't result in invalid Python syntax.
     """
 
-    def __init__(self, usage_map: dict[Construct, list[Reference]], project_root: Path):
-        """Initialize the safe docstring modifier."""
+    def __init__(
+        self,
+        usage_map: dict[Construct, list[Reference]],
+        project_root: Path,
+        path_cache: dict[Path, tuple[Path, str]] | None = None,
+    ):
+        """
+        Initialize the safe docstring modifier.
+
+        Args:
+            usage_map: Mapping of constructs to their usage references
+            project_root: Root directory of the project for relative paths
+            path_cache: Resolved path and display string per reference file;
+                pass the same dict to modifiers for other files to share it
+        """
         self.usage_map = usage_map
         self.project_root = project_root
         self.current_file: Path | None = None
+        # Resolved once here rather than once per reference
+        self._resolved_root = project_root.resolve()
+        self._resolved_current_file: Path | None = None
+        self._path_cache = path_cache if path_cache is not None else {}
 
         # Build lookup map
         self.construct_lookup: dict[Path, dict[str, Construct]] = {}
@@ -43,6 +62,7 @@ class SafeDocstringModifier(cst.CSTTransformer):
     def set_current_file(self, file_path: Path) -> None:
         """Set the current file being processed."""
         self.current_file = file_path
+        self._resolved_current_file = file_path.resolve()
 
     def _safe_create_docstring(self, content: str, original_quotes: str | None = None) -> str:
         """
@@ -150,30 +170,15 @@ class SafeDocstringModifier(cst.CSTTransformer):
             base_indent = original_indent
 
         # Convert references to relative paths
-        new_paths = set()
-        for ref in references:
-            if self.current_file and ref.file_path.resolve() == self.current_file.resolve():
-                continue
-            try:
-                resolved_file = ref.file_path.resolve()
-                resolved_root = self.project_root.resolve()
-                rel_path = resolved_file.relative_to(resolved_root)
-            except ValueError:
-                try:
-                    rel_path = ref.file_path.relative_to(self.project_root)
-                except ValueError:
-                    rel_path = ref.file_path
-            new_paths.add(str(rel_path))
+        new_paths = self._reference_paths(references)
 
         # Merge paths
         all_paths = existing_paths | new_paths
 
         # Generate usage section
         if all_paths:
-            usage_lines = []
-            for path in sorted(all_paths):
-                usage_lines.append(f"{base_indent}- {path}")
-            usage_section = f"{base_indent}Used in:\n" + "\n".join(usage_lines)
+            line_prefix = f"{base_indent}- "
+            usage_section = f"{base_indent}Used in:\n" + "\n".join(line_prefix + path for path in sorted(all_paths))
         else:
             usage_section = ""
 
@@ -190,6 +195,20 @@ class SafeDocstringModifier(cst.CSTTransformer):
         # Create safe docstring
         return self._safe_create_docstring(updated_content, quote_style)
 
+    def _reference_paths(self, references: list[Reference]) -> set[str]:
+        """
+        Get the display paths of the files referencing a construct, leaving out the current file.
+
+        Shared with DocstringModifier, so both modifiers write the same entries.
+        """
+        return reference_display_paths(
+            references,
+            project_root=self.project_root,
+            resolved_root=self._resolved_root,
+            resolved_current_file=self._resolved_current_file,
+            path_cache=self._path_cache,
+        )
+
     def _extract_existing_usage_paths(self, content: str) -> tuple[str, set[str], str]:
         """Extract existing 'Used in:' paths from docstring."""
         pattern = r"(\n\s*)(Used in:(?:\s*\n(?:\s*-\s*[^\n]+\n?)*)\s*)"
@@ -313,26 +332,11 @@ class SafeDocstringModifier(cst.CSTTransformer):
         """Create a new docstring with usage information."""
         base_indent = "    "
 
-        relative_paths = set()
-        for ref in references:
-            if self.current_file and ref.file_path.resolve() == self.current_file.resolve():
-                continue
-            try:
-                resolved_file = ref.file_path.resolve()
-                resolved_root = self.project_root.resolve()
-                rel_path = resolved_file.relative_to(resolved_root)
-            except ValueError:
-                try:
-                    rel_path = ref.file_path.relative_to(self.project_root)
-                except ValueError:
-                    rel_path = ref.file_path
-            relative_paths.add(str(rel_path))
+        relative_paths = self._reference_paths(references)
 
         if relative_paths:
-            usage_lines = []
-            for path in sorted(relative_paths):
-                usage_lines.append(f"{base_indent}- {path}")
-            usage_section = "Used in:\n" + "\n".join(usage_lines)
+            line_prefix = f"{base_indent}- "
+            usage_section = "Used in:\n" + "\n".join(line_prefix + path for path in sorted(relative_paths))
             return self._safe_create_docstring(usage_section)
 
         return '""""""'
@@ -374,6 +378,8 @@ class SafeLibCSTModifier:
     def __init__(self, project_root: Path):
         """Initialize the safe modifier."""
         self.project_root = project_root
+        # Resolved path and display string per reference file, shared by all files modified
+        self._path_cache: dict[Path, tuple[Path, str]] = {}
 
     def modify_file(
         self, file_path: Path, usage_map: dict[Construct, list[Reference]], dry_run: bool = False, backup: bool = True
@@ -392,8 +398,7 @@ class SafeLibCSTModifier:
         """
         try:
             # Read the source code
-            with open(file_path, encoding="utf-8") as f:
-                source_code = f.read()
+            source_code = read_source(file_path)
 
             # Validate original syntax
             if not self._validate_syntax(source_code):
@@ -409,7 +414,7 @@ class SafeLibCSTModifier:
             tree = cst.parse_module(source_code)
 
             # Create and run transformer
-            transformer = SafeDocstringModifier(usage_map, self.project_root)
+            transformer = SafeDocstringModifier(usage_map, self.project_root, self._path_cache)
             transformer.set_current_file(file_path)
             modified_tree = tree.visit(transformer)
 
@@ -428,8 +433,7 @@ class SafeLibCSTModifier:
 
             # Write changes if not dry run
             if not dry_run:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(modified_code)
+                write_source(file_path, modified_code)
 
                 # Remove backup if successful
                 if backup:
@@ -449,6 +453,40 @@ class SafeLibCSTModifier:
                     shutil.move(backup_path, file_path)
             return False
 
+    def modify_files(
+        self,
+        usage_results: dict[Construct, list[Reference]],
+        dry_run: bool = False,
+        backup: bool = True,
+        num_workers: int | None = None,
+    ) -> dict[str, bool]:
+        """
+        Safely modify every file that defines a referenced construct.
+
+        Each file goes through `modify_file`, so it keeps its own syntax
+        checks and backup. Large batches are spread over worker processes;
+        small ones are handled in-process.
+
+        Args:
+            usage_results: Results from reference analysis
+            dry_run: If True, don't actually write changes
+            backup: If True, create a backup before modifying each file
+            num_workers: Number of worker processes. Defaults to the CPU count.
+
+        Returns:
+            Dictionary mapping file paths to success status
+
+        Used in:
+        - pipeline.py
+        - tests/test_modifier.py
+        - tests/test_safe_integration.py
+        """
+        # Each batch starts from fresh paths: files may have moved since the last one
+        self._path_cache.clear()
+        items = list(group_by_file(usage_results).items())
+        modify = functools.partial(SafeLibCSTModifier.modify_file, dry_run=dry_run, backup=backup)
+        return {str(file_path): success for file_path, success in process_files(self, items, modify, num_workers)}
+
     def _validate_syntax(self, code: str) -> bool:
         """Validate that code has valid Python syntax."""
         try:
@@ -8,14 +8,84 @@ This module provides a CachedParser class that can wrap any uzpy parser
 This helps to speed up repeated parsing of unchanged files.
 """
 
-import hashlib
+import copy
+import json
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 import diskcache  # type: ignore[import-untyped]
 from loguru import logger
 
-from uzpy.types import Construct
+from uzpy._hashing import CACHE_SETTINGS, hash_file_content, stat_signature
+from uzpy.parser.common import parse_in_workers, worker_count
+from uzpy.parser.tree_sitter_parser import _module_full_name
+from uzpy.types import Construct, ConstructType
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+
+def _constructs_to_json(constructs: list[Construct]) -> str:
+    """
+    Serialize constructs to a compact JSON string for the cache.
+
+    Only the plain data fields are stored; the Tree-sitter node is dropped
+    because it cannot be pickled and is not needed once parsing is done.
+    Nothing that depends on the file's location is stored either (the file
+    path, and the module construct's name and dotted name), so one entry
+    serves every copy of the same source.
+
+    Args:
+        constructs: The constructs to serialize.
+
+    Returns:
+        A JSON array with one object per construct.
+    """
+    rows = []
+    for c in constructs:
+        row: dict[str, Any] = {"type": c.type.value, "line_number": c.line_number, "docstring": c.docstring}
+        if c.type is not ConstructType.MODULE:
+            row["name"] = c.name
+            row["full_name"] = c.full_name
+        rows.append(row)
+    return json.dumps(rows, separators=(",", ":"))
+
+
+def _constructs_from_json(blob: str, file_path: Path) -> list[Construct]:
+    """
+    Rebuild constructs from a JSON string produced by `_constructs_to_json`.
+
+    Args:
+        blob: The cached JSON string.
+        file_path: The file the constructs are being loaded for.
+
+    Returns:
+        A list of Construct objects (with `node` set to None).
+    """
+    module_name = file_path.stem
+    module_full_name = _module_full_name(file_path)
+    constructs = []
+    for data in json.loads(blob):
+        construct_type = ConstructType(data["type"])
+        is_module = construct_type is ConstructType.MODULE
+        construct = Construct(
+            name=module_name if is_module else data["name"],
+            type=construct_type,
+            file_path=file_path,
+            line_number=data["line_number"],
+            docstring=None,
+            full_name=module_full_name if is_module else data["full_name"],
+        )
+        # The stored docstring is already cleaned; assign it directly so
+        # __post_init__ does not normalize it a second time.
+        construct.docstring = data["docstring"]
+        constructs.append(construct)
+    return constructs
+
+
+def _parse_to_json(parser: Any, file_path: Path) -> str:
+    """Parse a file in a worker process and serialize the constructs for the cache."""
+    return _constructs_to_json(parser.parse_file(file_path))
 
 
 class CachedParser:
@@ -26,6 +96,13 @@ class CachedParser:
     reducing redundant computation for unchanged files.
     """
 
+    # Maximum number of files kept in the in-process fast path
+    MEMORY_CACHE_SIZE: ClassVar[int] = 4096
+
+    # Files smaller than this (in bytes) parse faster than a disk cache round
+    # trip, so they are only kept in the in-process fast path
+    MIN_DISK_CACHE_SIZE: ClassVar[int] = 2048
+
     def __init__(self, parser: Any, cache_dir: Path, cache_name: str = "parser_cache"):
         """
         Initialize the CachedParser.
@@ -37,28 +114,47 @@ class CachedParser:
         """
         self.parser = parser
         self.cache_path = cache_dir / cache_name
-        self.cache = diskcache.Cache(str(self.cache_path))  # Ensure cache_path is string
+        self.cache = diskcache.Cache(str(self.cache_path), **CACHE_SETTINGS)  # Ensure cache_path is string
+        # In-process fast path: file path -> ((mtime_ns, size, inode), constructs)
+        self._memory_cache: dict[Path, tuple[tuple[int, int, int], list[Construct]]] = {}
+        # Content hashes keyed by the same signature, so unchanged files are never re-read
+        self._stat_hash_cache: dict[Path, tuple[tuple[int, int, int], str]] = {}
+
         logger.info(f"CachedParser initialized. Cache location: {self.cache_path}")
 
-    def _get_file_hash(self, file_path: Path) -> str:
+    def _get_file_hash(self, file_path: Path, signature: tuple[int, int, int] | None = None) -> str:
         """
-        Generate a hash for a file based on its content and modification time.
+        Generate a hash of a file's content.
+
+        The content hash is only recomputed when the file's stat signature
+        (mtime, size, inode) changes since the last call. The signature and
+        hash are also stored in the disk cache, so later runs can reuse the
+        hash of an unchanged file without reading it again.
 
         Args:
             file_path: The path to the file.
+            signature: The file's signature from `_file_signature`, if the
+                caller already has it; the file is stat-ed otherwise.
 
         Returns:
-            A string hash representing the file's state.
+            A string hash of the file's content.
         """
         try:
-            stat = file_path.stat()
-            # Read file in chunks to handle large files efficiently
-            hasher = hashlib.md5()
-            with open(file_path, "rb") as f:
-                while chunk := f.read(8192):  # 8KB chunks
-                    hasher.update(chunk)
-            content_hash = hasher.hexdigest()
-            return f"{content_hash}-{stat.st_mtime_ns}"
+            if signature is None:
+                signature = stat_signature(file_path)
+            cached = self._stat_hash_cache.get(file_path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            hash_key = f"file_hash:{file_path}"
+            cached = self.cache.get(hash_key)
+            if cached is not None and tuple(cached[0]) == signature:
+                self._stat_hash_cache[file_path] = (signature, cached[1])
+                return cached[1]
+
+            content_hash = hash_file_content(file_path, signature[1])
+            self._stat_hash_cache[file_path] = (signature, content_hash)
+            self.cache.set(hash_key, (signature, content_hash))
+            return content_hash
         except FileNotFoundError:
             logger.warning(f"File not found for hashing: {file_path}")
             return f"nonexistent-{file_path.name}"
@@ -66,24 +162,106 @@ class CachedParser:
             logger.error(f"Error hashing file {file_path}: {e}")
             return f"error-{file_path.name}"
 
-    def _get_parse_cache_key(self, file_path: Path) -> str:
+    def _get_parse_cache_key(self, file_path: Path, signature: tuple[int, int, int] | None = None) -> str:
         """
         Generate a cache key for parsing a specific file.
 
+        The key depends only on the file's content, so identical files
+        (vendored or copied modules) share a single cache entry.
+
         Args:
             file_path: The Path object of the file to be parsed.
+            signature: The file's signature, passed on to `_get_file_hash`.
 
         Returns:
             A string cache key.
         """
-        file_hash = self._get_file_hash(file_path)
-        # Using a tuple for the key components before joining
-        key_parts = (
-            "parse_file",
-            str(file_path.name),  # Use name for key component
-            file_hash,
-        )
-        return ":".join(key_parts)
+        return f"parse_file:{self._get_file_hash(file_path, signature)}"
+
+    def _file_signature(self, file_path: Path) -> tuple[int, int, int] | None:
+        """
+        Get the (mtime_ns, size, inode) signature used by both cache layers.
+
+        It is taken once per lookup and passed along, so a file is stat-ed
+        only once on its way through the caches.
+
+        Args:
+            file_path: The path to the file.
+
+        Returns:
+            The signature, or None if the file cannot be stat-ed.
+        """
+        try:
+            return stat_signature(file_path)
+        except OSError:
+            return None
+
+    def _uses_disk_cache(self, signature: tuple[int, int, int] | None) -> bool:
+        """
+        Tell whether a file with this signature goes through the disk cache.
+
+        Args:
+            signature: The file's (mtime_ns, size, inode) signature, or None if unknown.
+
+        Returns:
+            False for files below MIN_DISK_CACHE_SIZE, True otherwise.
+        """
+        return signature is None or signature[1] >= self.MIN_DISK_CACHE_SIZE
+
+    def _get_cached(self, file_path: Path, signature: tuple[int, int, int] | None) -> list[Construct] | None:
+        """
+        Look up a file in the in-process fast path, then in the disk cache.
+
+        Args:
+            file_path: The path to the file.
+            signature: The file's current (mtime_ns, size, inode) signature.
+
+        Returns:
+            The cached constructs, or None on a miss.
+        """
+        # Repeat lookups of an unchanged file never touch the disk cache
+        if signature is not None:
+            memory_hit = self._memory_cache.get(file_path)
+            if memory_hit is not None and memory_hit[0] == signature:
+                logger.debug(f"Memory cache hit for parsing {file_path}")
+                # Hand out fresh copies so one caller's edits never reach the next lookup
+                return [copy.copy(c) for c in memory_hit[1]]
+
+        if not self._uses_disk_cache(signature):
+            return None
+
+        cache_key = self._get_parse_cache_key(file_path, signature)
+
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            logger.debug(f"Cache hit for parsing {file_path} (key: {cache_key})")
+            constructs = _constructs_from_json(cached_result, file_path)
+            self._remember(file_path, signature, constructs)
+            return constructs
+
+        logger.debug(f"Cache miss for parsing {file_path} (key: {cache_key}).")
+        return None
+
+    def _store(self, file_path: Path, signature: tuple[int, int, int] | None, serialized: str) -> list[Construct]:
+        """
+        Store a serialized parse result in both cache layers.
+
+        Args:
+            file_path: The parsed file.
+            signature: The file's (mtime_ns, size, inode) at parse time.
+            serialized: The constructs as produced by `_constructs_to_json`.
+
+        Returns:
+            The constructs rebuilt from `serialized`.
+        """
+        if self._uses_disk_cache(signature):
+            cache_key = self._get_parse_cache_key(file_path, signature)
+            self.cache.set(cache_key, serialized)
+            logger.debug(f"Stored parsing result for {file_path} in cache (key: {cache_key})")
+
+        constructs = _constructs_from_json(serialized, file_path)
+        self._remember(file_path, signature, constructs)
+        return constructs
 
     def parse_file(self, file_path: Path) -> list[Construct]:
         """
@@ -95,41 +273,128 @@ class CachedParser:
         Returns:
             A list of Construct objects.
         """
-        cache_key = self._get_parse_cache_key(file_path)
+        signature = self._file_signature(file_path)
+        cached = self._get_cached(file_path, signature)
+        if cached is not None:
+            return cached
 
-        cached_result = self.cache.get(cache_key)
-        if cached_result is not None:
-            logger.debug(f"Cache hit for parsing {file_path} (key: {cache_key})")
-            # Tree-sitter nodes in Construct objects are not directly serializable by default with pickle.
-            # If Construct objects are stored with Nodes, they need to be handled.
-            # For this implementation, we assume that if Constructs are cached,
-            # their 'node' attribute is either None or handled during serialization/deserialization.
-            # A common practice is to set node=None before caching if the node is not needed later.
-            # If 'node' is essential, a custom (de)serializer for diskcache or for Construct would be required.
-            # For now, returning the cached result as is.
-            return cached_result  # type: ignore[no-any-return]  # diskcache.get() is typed Any
-
-        logger.debug(f"Cache miss for parsing {file_path} (key: {cache_key}). Parsing...")
         if not hasattr(self.parser, "parse_file") or not callable(self.parser.parse_file):
             logger.error(f"Wrapped parser {type(self.parser)} does not have a callable 'parse_file' method.")
             return []
 
+        return self._parse_uncached(file_path, signature)
+
+    def _parse_uncached(self, file_path: Path, signature: tuple[int, int, int] | None) -> list[Construct]:
+        """
+        Parse a file both cache layers missed and record the result in them.
+
+        Args:
+            file_path: The file to parse.
+            signature: The file's (mtime_ns, size, inode) signature from the lookup.
+
+        Returns:
+            The wrapped parser's constructs.
+        """
         result = self.parser.parse_file(file_path)  # parser is Any (duck-typed)
 
-        # Potentially strip or handle non-serializable parts of Construct before caching
-        # For example, if construct.node (Tree-sitter node) is problematic:
-        # result_to_cache = [dataclasses.replace(c, node=None) for c in result]
-        # self.cache.set(cache_key, result_to_cache)
-        # For now, caching as is.
-        self.cache.set(cache_key, result)
+        if self._uses_disk_cache(signature):
+            # Constructs are stored as JSON rather than pickled: it is smaller, faster
+            # to load, and sidesteps the unpicklable Tree-sitter node.
+            cache_key = self._get_parse_cache_key(file_path, signature)
+            self.cache.set(cache_key, _constructs_to_json(result))
+            logger.debug(f"Stored parsing result for {file_path} in cache (key: {cache_key})")
 
-        logger.debug(f"Stored parsing result for {file_path} in cache (key: {cache_key})")
+        self._remember(file_path, signature, result)
         return result  # type: ignore[no-any-return]
 
+    def get_statistics(self, file_path: Path, constructs: list[Construct] | None = None) -> dict[str, int]:
+        """
+        Get parsing statistics for a file, parsing it through the cache when needed.
+
+        Args:
+            file_path: Path to the Python file.
+            constructs: Constructs already parsed from the file; looked up if not given.
+
+        Returns:
+            The wrapped parser's statistics for the file.
+        """
+        if constructs is None:
+            constructs = self.parse_file(file_path)
+        return self.parser.get_statistics(file_path, constructs)  # type: ignore[no-any-return]
+
+    def parse_files(self, file_paths: list[Path], num_workers: int | None = None) -> dict[Path, list[Construct]]:
+        """
+        Parse many files, spreading cache misses over a process pool.
+
+        Each worker process builds one instance of the wrapped parser's class
+        (which must be constructible without arguments) and reuses it for
+        every file it is given. Small batches are parsed in-process.
+
+        Args:
+            file_paths: The files to parse.
+            num_workers: Number of worker processes. Defaults to the CPU count.
+
+        Returns:
+            A dictionary mapping each successfully parsed file to its constructs,
+            in the order of `file_paths`. Constructs parsed by workers or loaded
+            from the disk cache have `node` set to None.
+        """
+        results: dict[Path, list[Construct]] = {}
+        misses: dict[Path, tuple[int, int, int] | None] = {}
+        for file_path in file_paths:
+            signature = self._file_signature(file_path)
+            cached = self._get_cached(file_path, signature)
+            if cached is not None:
+                results[file_path] = cached
+            else:
+                misses[file_path] = signature
+
+        workers = worker_count(len(misses), num_workers)
+        if not workers:
+            # The lookups above already missed; parse straight away with their signatures
+            for file_path, signature in misses.items():
+                try:
+                    results[file_path] = self._parse_uncached(file_path, signature)
+                except Exception as e:
+                    logger.error(f"Failed to parse {file_path}: {e}")
+        else:
+            for chunk_results in parse_in_workers(type(self.parser), list(misses), _parse_to_json, workers):
+                # Commit each chunk's cache writes in a single SQLite transaction
+                with self.cache.transact(retry=True):
+                    for file_path, serialized in chunk_results:
+                        if serialized is not None:
+                            results[file_path] = self._store(file_path, misses[file_path], serialized)
+
+        return {file_path: results[file_path] for file_path in file_paths if file_path in results}
+
+    def _remember(self, file_path: Path, signature: tuple[int, int, int] | None, constructs: list[Construct]) -> None:
+        """
+        Record a parse result in the in-process fast path.
+
+        The constructs are stored as copies, so the caller stays free to
+        mutate its own; copies never hold a Tree-sitter node, so the cache
+        never keeps syntax trees alive either.
+
+        Args:
+            file_path: The parsed file.
+            signature: The file's (mtime_ns, size, inode) at parse time, or None if unknown.
+            constructs: The constructs to remember.
+        """
+        if signature is None:
+            return
+        self._memory_cache.pop(file_path, None)
+        if len(self._memory_cache) >= self.MEMORY_CACHE_SIZE:
+            # Evict the oldest entry (dicts preserve insertion order)
+            del self._memory_cache[next(iter(self._memory_cache))]
+        # Keep node-free copies: a Tree-sitter node pins its file's whole syntax tree
+        remembered = [copy.copy(c) for c in constructs]
+        self._memory_cache[file_path] = (signature, remembered)
+
     def clear(self) -> None:
         """Clear the entire cache."""
         count = len(self.cache)
         self.cache.clear()
+        self._memory_cache.clear()
         logger.info(f"Cache cleared. {count} items removed from {self.cache_path}.")
 
     def stats(self) -> dict[str, Any]:
@@ -144,16 +409,22 @@ class CachedParser:
         self.cache.close()
         logger.info(f"Cache closed: {self.cache_path}")
 
-    def __del__(self) -> None:
-        """Ensure cache is closed when the object is deleted."""
+    def __enter__(self) -> "Self":
+        """Use the parser as a context manager that closes the cache on exit."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the cache when leaving a `with` block."""
         self.close()
 
     def __getattr__(self, name: str) -> Any:
-        """Delegate attribute access to the wrapped parser if not found in CachedParser."""
-        if hasattr(self.parser, name):
-            return getattr(self.parser, name)
+        """Fallback delegation to the wrapped parser for attributes not defined here."""
+        # Read from __dict__ so a half-initialized instance cannot recurse here
+        parser = self.__dict__.get("parser")
+        if parser is not None and hasattr(parser, name):
+            return getattr(parser, name)
         msg = (
             f"'{type(self).__name__}' object and its wrapped parser "
-            f"'{type(self.parser).__name__}' have no attribute '{name}'"
+            f"'{type(parser).__name__}' have no attribute '{name}'"
         )
         raise AttributeError(msg)
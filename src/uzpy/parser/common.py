@@ -0,0 +1,108 @@
+# this_file: src/uzpy/parser/common.py
+
+"""
+Process-pool helpers shared by TreeSitterParser and CachedParser.
+
+Both parsers hand batches of files to worker processes the same way:
+small batches stay in-process, larger ones are cut into chunks sized to
+keep every worker busy, and each worker builds one parser for all of its
+chunks.
+"""
+
+import concurrent.futures
+import functools
+import os
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any, TypeVar
+
+from loguru import logger
+
+_T = TypeVar("_T")
+
+# Below this many files, parse_files parses in-process; a process pool costs more to start
+_PARALLEL_MIN_FILES = 8
+
+# Largest number of files handed to a worker per task
+_CHUNK_SIZE = 50
+
+# Parser instance owned by a worker process, created once by _init_worker
+_worker_parser: Any = None
+
+
+def worker_count(file_count: int, num_workers: int | None = None) -> int:
+    """
+    Get the number of worker processes to parse `file_count` files with.
+
+    Args:
+        file_count: Number of files to parse.
+        num_workers: Requested number of workers. Defaults to the CPU count.
+
+    Returns:
+        The number of workers, or 0 when the files should be parsed in-process.
+
+    Used in:
+    - src/uzpy/parser/cached_parser.py
+    - src/uzpy/parser/tree_sitter_parser.py
+    """
+    workers = num_workers if num_workers is not None else (os.cpu_count() or 1)
+    if file_count < _PARALLEL_MIN_FILES or workers <= 1:
+        return 0
+    return workers
+
+
+def _init_worker(parser_type: type) -> None:
+    """Create the parser a worker process reuses for all of its chunks."""
+    global _worker_parser
+    _worker_parser = parser_type()
+
+
+def _run_chunk(task: Callable[[Any, Path], _T], file_paths: list[Path]) -> list[tuple[Path, _T | None]]:
+    """Run `task` on a chunk of files in a worker process; failed files get None."""
+    results: list[tuple[Path, _T | None]] = []
+    for file_path in file_paths:
+        try:
+            results.append((file_path, task(_worker_parser, file_path)))
+        except Exception as e:
+            logger.error(f"Failed to parse {file_path}: {e}")
+            results.append((file_path, None))
+    return results
+
+
+def parse_in_workers(
+    parser_type: type,
+    file_paths: list[Path],
+    task: Callable[[Any, Path], _T],
+    workers: int,
+) -> Iterator[list[tuple[Path, _T | None]]]:
+    """
+    Run `task(parser, file_path)` on every file in a process pool.
+
+    Each worker builds one `parser_type()` (which must be constructible
+    without arguments) and reuses it for every file it is given. `task`
+    must be picklable, such as a plain method of the parser class or a
+    module-level function.
+
+    Args:
+        parser_type: The parser class the workers instantiate.
+        file_paths: The files to parse.
+        task: Work to do per file.
+        workers: Number of worker processes, as returned by `worker_count`.
+
+    Yields:
+        One list of (path, result) pairs per chunk, in the order of
+        `file_paths`; result is None for files that failed.
+
+    Used in:
+    - src/uzpy/parser/cached_parser.py
+    - src/uzpy/parser/tree_sitter_parser.py
+    """
+    # Batch files to keep IPC round-trips few, but never so coarsely that
+    # some workers are left idle on mid-sized inputs
+    chunk_size = min(_CHUNK_SIZE, -(-len(file_paths) // workers))
+    chunks = [file_paths[i : i + chunk_size] for i in range(0, len(file_paths), chunk_size)]
+    logger.info(f"Parsing {len(file_paths)} files with {min(workers, len(chunks))} worker(s)")
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)), initializer=_init_worker, initargs=(parser_type,)
+    ) as executor:
+        yield from executor.map(functools.partial(_run_chunk, task), chunks)
@@ -11,13 +11,67 @@ Used in:
 - parser/tree_sitter_parser.py
 """
 
+import functools
+import threading
 from pathlib import Path
 
 import tree_sitter_python as tspython
 from loguru import logger
 from tree_sitter import Language, Node, Parser
 
-from uzpy.types import Construct, ConstructType
+from uzpy.parser.common import parse_in_workers, worker_count
+from uzpy.types import Construct, ConstructType, trim_docstring
+
+# Node types whose children can contain function or class definitions. Everything
+# else (simple statements, expressions, parameters) is skipped without descending.
+# ERROR nodes are included so definitions after a syntax error are still found.
+_CONTAINER_TYPES = frozenset(
+    {
+        "module",
+        "block",
+        "class_definition",
+        "function_definition",
+        "decorated_definition",
+        "if_statement",
+        "for_statement",
+        "while_statement",
+        "try_statement",
+        "with_statement",
+        "match_statement",
+        "ERROR",
+    }
+)
+
+
+# Per-thread tree-sitter Parser objects (a Parser must not be shared between threads)
+_thread_state = threading.local()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_language() -> Language:
+    """Return the Python grammar, loaded once per process."""
+    # tspython.language() returns a PyCapsule that needs to be wrapped
+    return Language(tspython.language())
+
+
+def _get_thread_parser() -> Parser:
+    """Return the calling thread's tree-sitter Parser, creating it on first use."""
+    parser: Parser | None = getattr(_thread_state, "parser", None)
+    if parser is None:
+        parser = Parser(_get_language())
+        _thread_state.parser = parser
+    return parser
+
+
+def _module_full_name(file_path: Path) -> str:
+    """Return the dotted name used for the module construct of `file_path`."""
+    # Path.parts is computed once and cached by pathlib; dropping the anchor
+    # from it avoids building an intermediate relative Path
+    parts = file_path.parts[1:] if file_path.anchor else file_path.parts
+    full_name = ".".join(parts).replace("\\", ".")
+    if full_name.endswith(".py"):
+        full_name = full_name[:-3]
+    return full_name
 
 
 class TreeSitterParser:
@@ -46,50 +100,22 @@ class TreeSitterParser:
         Used in:
         - parser/tree_sitter_parser.py
         """
-        # tspython.language() returns a PyCapsule that needs to be wrapped
-        self.language = Language(tspython.language())
-        self.parser = Parser(self.language)
-
-        # Queries for finding different construct types
-        self._init_queries()
+        self.language = _get_language()
 
         logger.debug("Tree-sitter parser initialized")
 
-    def _init_queries(self) -> None:
-        """Initialize Tree-sitter queries for finding constructs.
+    @property
+    def parser(self) -> Parser:
+        """The tree-sitter Parser for the calling thread.
+
+        Parser objects are not thread-safe, so each thread gets its own; it is
+        shared by every TreeSitterParser used on that thread.
 
         Used in:
         - parser/tree_sitter_parser.py
+        - tests/test_parser.py
         """
-        # Query for function definitions
-        self.function_query = self.language.query("""
-        (function_definition
-          name: (identifier) @function_name
-          body: (block) @function_body) @function_def
-        """)
-
-        # Query for class definitions
-        self.class_query = self.language.query("""
-        (class_definition
-          name: (identifier) @class_name
-          body: (block) @class_body) @class_def
-        """)
-
-        # Query for method definitions (functions inside classes)
-        self.method_query = self.language.query("""
-        (class_definition
-          body: (block
-            (function_definition
-              name: (identifier) @method_name
-              body: (block) @method_body) @method_def)) @class_def
-        """)
-
-        # Query for docstrings (string expressions at start of blocks)
-        self.docstring_query = self.language.query("""
-        (block
-          (expression_statement
-            (string) @docstring) @doc_stmt) @block
-        """)
+        return _get_thread_parser()
 
     def parse_file(self, file_path: Path) -> list[Construct]:
         """
@@ -103,7 +129,7 @@ class TreeSitterParser:
 
         Raises:
             FileNotFoundError: If the file doesn't exist
-            UnicodeDecodeError: If the file can't be decoded as UTF-8
+            UnicodeDecodeError: If a construct's name or docstring isn't valid UTF-8
 
         Used in:
         - parser/tree_sitter_parser.py
@@ -127,6 +153,28 @@ class TreeSitterParser:
             logger.error(f"Unicode decode error in {file_path}: {e}")
             raise
 
+        return self.parse_bytes(source_code, file_path)
+
+    def parse_bytes(self, source_code: bytes, file_path: Path) -> list[Construct]:
+        """
+        Extract all constructs from source that has already been read.
+
+        Lets callers that need the file's bytes for something else avoid
+        reading it a second time. `file_path` is only used to label the
+        constructs and name the module.
+
+        Args:
+            source_code: The file's contents
+            file_path: Path the contents were read from
+
+        Returns:
+            List of Construct objects found in the source
+
+        Used in:
+        - parser/tree_sitter_parser.py
+        - tests/test_parser.py
+        - tests/test_safe_integration.py
+        """
         # Parse with Tree-sitter
         tree = self.parser.parse(source_code)
 
@@ -136,290 +184,237 @@ class TreeSitterParser:
         # Extract constructs
         constructs = []
 
-        # Get source code as string for node text extraction
-        source_text = source_code.decode("utf-8")
-
-        # Extract module-level constructs
-        constructs.extend(self._extract_functions(tree.root_node, file_path, source_text))
-        constructs.extend(self._extract_classes(tree.root_node, file_path, source_text))
-        constructs.extend(self._extract_methods(tree.root_node, file_path, source_text))
+        # Extract functions, classes and methods in a single pass over the tree
+        functions, classes, methods = self._walk_definitions(tree.root_node, file_path)
+        constructs.extend(functions)
+        constructs.extend(classes)
+        constructs.extend(methods)
 
         # Add module construct
-        module_construct = self._create_module_construct(file_path, tree.root_node, source_text)
+        module_construct = self._create_module_construct(file_path, tree.root_node)
         if module_construct:
             constructs.append(module_construct)
 
         logger.debug(f"Found {len(constructs)} constructs in {file_path}")
         return constructs
 
-    def _extract_functions(self, root_node: Node, file_path: Path, source_text: str) -> list[Construct]:
-        """Extract function definitions from the AST.
-
-        Used in:
-        - parser/tree_sitter_parser.py
+    def parse_files(self, file_paths: list[Path], num_workers: int | None = None) -> dict[Path, list[Construct]]:
         """
-        functions = []
+        Parse many files, spreading them over a process pool.
 
-        captures = self.function_query.captures(root_node)
+        Small batches are parsed in-process with this parser. Files that fail
+        to parse are logged and left out of the result.
 
-        # Process function definitions
-        for function_def in captures.get("function_def", []):
-            # Find function name and body directly from the function_def node structure
-            function_name = None
-            function_body = None
-
-            # Look for the identifier (function name) and block (function body) in the function_def children
-            for child in function_def.children:
-                if child.type == "identifier":
-                    function_name = self._get_node_text(child, source_text)
-                elif child.type == "block":
-                    function_body = child
-
-            if function_name and function_body:
-                # Check if this is actually a method (inside a class)
-                is_method = self._is_inside_class(function_def)
-
-                # Only process functions that are NOT methods (methods are handled by _extract_methods)
-                if not is_method:
-                    # Get docstring
-                    docstring = self._extract_docstring(function_body, source_text)
-
-                    # Calculate line number (Tree-sitter uses 0-based, we want 1-based)
-                    line_number = function_def.start_point[0] + 1
-
-                    # Build full name
-                    full_name = self._build_full_name(function_def, function_name, source_text)
-
-                    construct = Construct(
-                        name=function_name,
-                        type=ConstructType.FUNCTION,
-                        file_path=file_path,
-                        line_number=line_number,
-                        docstring=docstring,
-                        full_name=full_name,
-                        node=function_def,
-                    )
-
-                    functions.append(construct)
-
-        return functions
+        Args:
+            file_paths: The files to parse.
+            num_workers: Number of worker processes. Defaults to the CPU count.
 
-    def _extract_classes(self, root_node: Node, file_path: Path, source_text: str) -> list[Construct]:
-        """Extract class definitions from the AST.
+        Returns:
+            A dictionary mapping each successfully parsed file to its constructs,
+            in the order of `file_paths`. Constructs parsed by workers have
+            `node` set to None.
 
         Used in:
-        - parser/tree_sitter_parser.py
+        - pipeline.py
+        - tests/test_parser.py
         """
-        classes = []
-
-        captures = self.class_query.captures(root_node)
-
-        # Process class definitions
-        for class_def in captures.get("class_def", []):
-            # Get captures for this specific class
-            class_captures = self.class_query.captures(class_def)
-
-            class_name = None
-            class_body = None
-
-            # Extract name and body
-            if "class_name" in class_captures:
-                class_name = self._get_node_text(class_captures["class_name"][0], source_text)
-            if "class_body" in class_captures:
-                class_body = class_captures["class_body"][0]
-
-            if class_name and class_body:
-                # Get docstring
-                docstring = self._extract_docstring(class_body, source_text)
-
-                # Calculate line number
-                line_number = class_def.start_point[0] + 1
-
-                # Build full name
-                full_name = self._build_full_name(class_def, class_name, source_text)
-
-                construct = Construct(
-                    name=class_name,
-                    type=ConstructType.CLASS,
-                    file_path=file_path,
-                    line_number=line_number,
-                    docstring=docstring,
-                    full_name=full_name,
-                    node=class_def,
-                )
-
-                classes.append(construct)
-
-        return classes
-
-    def _extract_methods(self, root_node: Node, file_path: Path, source_text: str) -> list[Construct]:
-        """Extract method definitions from classes.
+        results: dict[Path, list[Construct]] = {}
+        workers = worker_count(len(file_paths), num_workers)
+        if not workers:
+            for file_path in file_paths:
+                try:
+                    results[file_path] = self.parse_file(file_path)
+                except Exception as e:
+                    logger.error(f"Failed to parse {file_path}: {e}")
+            return results
+
+        # Constructs pickle without their tree-sitter node, so they arrive with `node` set to None
+        for chunk_results in parse_in_workers(TreeSitterParser, file_paths, TreeSitterParser.parse_file, workers):
+            for file_path, constructs in chunk_results:
+                if constructs is not None:
+                    results[file_path] = constructs
+        return results
+
+    def _walk_definitions(
+        self, root_node: Node, file_path: Path
+    ) -> tuple[list[Construct], list[Construct], list[Construct]]:
+        """Extract function, class and method definitions in one depth-first walk.
+
+        A stack of enclosing class names is kept while descending, so full names
+        come for free. Functions inside a class are reported as methods only
+        when they sit directly in the class body; other functions nested in a
+        class scope are skipped.
 
         Used in:
         - parser/tree_sitter_parser.py
         """
-        methods = []
-
-        captures = self.method_query.captures(root_node)
-
-        # Process method definitions
-        for method_def in captures.get("method_def", []):
-            # Get the containing class
-            class_def = captures.get("class_def", [None])[0]
-            if not class_def:
+        functions: list[Construct] = []
+        classes: list[Construct] = []
+        methods: list[Construct] = []
+        class_names: list[str] = []  # Enclosing classes, outermost first
+
+        cursor = root_node.walk()
+        while True:
+            node = cursor.node
+            node_type = node.type
+
+            if node_type == "class_definition":
+                name_node = node.child_by_field_name("name")
+                body_node = node.child_by_field_name("body")
+                class_name = self._get_node_text(name_node) if name_node else ""
+                if class_name and body_node:
+                    construct = Construct(
+                        name=class_name,
+                        type=ConstructType.CLASS,
+                        file_path=file_path,
+                        # Tree-sitter uses 0-based lines, we want 1-based
+                        line_number=node.start_point[0] + 1,
+                        docstring=None,
+                        full_name=".".join([*class_names, class_name]),
+                        node=node,
+                    )
+                    construct.docstring = self._extract_docstring(body_node)
+                    classes.append(construct)
+                # Always push, so the pop when leaving the class stays balanced
+                class_names.append(class_name)
+
+            elif node_type == "function_definition":
+                name_node = node.child_by_field_name("name")
+                body_node = node.child_by_field_name("body")
+                if name_node and body_node:
+                    parent = node.parent
+                    construct_type: ConstructType | None = None
+                    if not class_names:
+                        construct_type = ConstructType.FUNCTION
+                    elif (
+                        parent and parent.type == "block" and parent.parent and parent.parent.type == "class_definition"
+                    ):
+                        construct_type = ConstructType.METHOD
+
+                    if construct_type is not None:
+                        function_name = self._get_node_text(name_node)
+                        construct = Construct(
+                            name=function_name,
+                            type=construct_type,
+                            file_path=file_path,
+                            line_number=node.start_point[0] + 1,
+                            docstring=None,
+                            full_name=".".join([*class_names, function_name]),
+                            node=node,
+                        )
+                        construct.docstring = self._extract_docstring(body_node)
+                        (functions if construct_type is ConstructType.FUNCTION else methods).append(construct)
+
+            # Descend into nodes that can contain definitions
+            if (node_type in _CONTAINER_TYPES or node_type.endswith("_clause")) and cursor.goto_first_child():
                 continue
 
-            # Find method name and body directly from the method_def node structure
-            method_name = None
-            method_body = None
-
-            # Look for the identifier (method name) and block (method body) in the method_def children
-            for child in method_def.children:
-                if child.type == "identifier":
-                    method_name = self._get_node_text(child, source_text)
-                elif child.type == "block":
-                    method_body = child
-
-            if method_name and method_body:
-                # Get docstring
-                docstring = self._extract_docstring(method_body, source_text)
-
-                # Calculate line number
-                line_number = method_def.start_point[0] + 1
-
-                # Build full name (including class)
-                full_name = self._build_full_name(method_def, method_name, source_text)
-
-                construct = Construct(
-                    name=method_name,
-                    type=ConstructType.METHOD,
-                    file_path=file_path,
-                    line_number=line_number,
-                    docstring=docstring,
-                    full_name=full_name,
-                    node=method_def,
-                )
-
-                methods.append(construct)
+            # Leave finished nodes until one has an unvisited sibling
+            while True:
+                if cursor.node.type == "class_definition":
+                    class_names.pop()
+                if cursor.goto_next_sibling():
+                    break
+                if not cursor.goto_parent():
+                    return functions, classes, methods
 
-        return methods
-
-    def _create_module_construct(self, file_path: Path, root_node: Node, source_text: str) -> Construct | None:
+    def _create_module_construct(self, file_path: Path, root_node: Node) -> Construct | None:
         """Create a construct representing the module itself.
 
         Used in:
         - parser/tree_sitter_parser.py
         """
-        # Look for module-level docstring (first statement is a string)
-        docstring = None
-
-        # Check first statement
-        for child in root_node.children:
-            if child.type == "expression_statement":
-                for grandchild in child.children:
-                    if grandchild.type == "string":
-                        docstring = self._get_node_text(grandchild, source_text)
-                        break
-                break
-
-        module_name = file_path.stem
-        full_name = str(file_path.relative_to(file_path.anchor)).replace("/", ".").replace("\\", ".")
-        if full_name.endswith(".py"):
-            full_name = full_name[:-3]
-
-        return Construct(
-            name=module_name,
+        construct = Construct(
+            name=file_path.stem,
             type=ConstructType.MODULE,
             file_path=file_path,
             line_number=1,
-            docstring=docstring,
-            full_name=full_name,
+            docstring=None,
+            full_name=_module_full_name(file_path),
             node=root_node,
         )
+        # Look for module-level docstring (first statement is a string)
+        construct.docstring = self._extract_docstring(root_node)
+        return construct
 
-    def _extract_docstring(self, body_node: Node, source_text: str) -> str | None:
-        """Extract docstring from a function or class body.
+    def _extract_docstring(self, body_node: Node) -> str | None:
+        """Extract the docstring from a module, function or class body.
+
+        Only the first statement is inspected: a string literal anywhere else
+        is not a docstring (PEP 257), so the walk stops there. The text
+        between the literal's opening and closing quotes is decoded and
+        trimmed here, so the construct receives it already clean (and string
+        prefixes such as r or u never leak into it).
 
         Used in:
         - parser/tree_sitter_parser.py
         """
-        # Look for the first expression statement that contains a string
         for child in body_node.children:
+            if child.type == "comment":
+                continue
             if child.type == "expression_statement":
-                for grandchild in child.children:
-                    if grandchild.type == "string":
-                        return self._get_node_text(grandchild, source_text)
+                first = child.children[0] if child.child_count == 1 else None
+                if first is not None and first.type == "string":
+                    return self._get_string_content(first)
+            return None
         return None
 
-    def _get_node_text(self, node: Node, source_text: str) -> str:
-        """Get the text content of a Tree-sitter node.
-
-        Tree-sitter works with byte positions, but Python strings use Unicode code points.
-        When the source contains non-ASCII characters, byte positions and string indices
-        diverge. We need to work with the original bytes and decode the specific slice.
+    def _get_string_content(self, string_node: Node) -> str:
+        """Get the trimmed text of a string literal, without prefix and quotes.
 
         Used in:
         - parser/tree_sitter_parser.py
         """
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-
-        # Convert source text back to bytes, slice, then decode
-        # This ensures we get the exact bytes that tree-sitter identified
-        source_bytes = source_text.encode("utf-8")
-        node_bytes = source_bytes[start_byte:end_byte]
-        return node_bytes.decode("utf-8")
+        text = string_node.text or b""
+        start = string_node.child(0)
+        end = string_node.child(string_node.child_count - 1)
+        if start is None or end is None or start.type != "string_start" or end.type != "string_end":
+            # Unterminated literal (syntax error): keep whatever follows the opening quotes
+            offset = start.end_byte - string_node.start_byte if start is not None else 0
+            return trim_docstring(text[offset:].decode())
+        base = string_node.start_byte
+        return trim_docstring(text[start.end_byte - base : end.start_byte - base].decode())
+
+    def _get_node_text(self, node: Node) -> str:
+        """Get the text content of a Tree-sitter node.
 
-    def _is_inside_class(self, node: Node) -> bool:
-        """Check if a node is inside a class definition.
+        Uses the node's own `text`, which tree-sitter slices from the source
+        bytes it keeps with the tree; only that slice is decoded. The default
+        codec (UTF-8) is used without naming it, which skips a codec lookup.
 
         Used in:
         - parser/tree_sitter_parser.py
         """
-        parent = node.parent
-        while parent:
-            if parent.type == "class_definition":
-                return True
-            parent = parent.parent
-        return False
-
-    def _build_full_name(self, node: Node, name: str, source_text: str) -> str:
-        """Build the fully qualified name for a construct.
+        return (node.text or b"").decode()
 
-        Used in:
-        - parser/tree_sitter_parser.py
-        """
-        parts = [name]
-
-        # Walk up the tree to find containing classes
-        parent = node.parent
-        while parent:
-            if parent.type == "class_definition":
-                # Find the class name
-                for child in parent.children:
-                    if child.type == "identifier":
-                        class_name = self._get_node_text(child, source_text)
-                        parts.insert(0, class_name)
-                        break
-            parent = parent.parent
-
-        return ".".join(parts)
-
-    def get_statistics(self, file_path: Path) -> dict[str, int]:
+    def get_statistics(self, file_path: Path, constructs: list[Construct] | None = None) -> dict[str, int]:
         """Get parsing statistics for a file.
 
+        Args:
+            file_path: Path to the Python file
+            constructs: Constructs already parsed from the file; parsed if not given
+
         Used in:
+        - parser/cached_parser.py
         - parser/tree_sitter_parser.py
         - tests/test_parser.py
         """
-        constructs = self.parse_file(file_path)
+        if constructs is None:
+            constructs = self.parse_file(file_path)
+
+        type_counts = dict.fromkeys(ConstructType, 0)
+        with_docstrings = 0
+        for construct in constructs:
+            type_counts[construct.type] += 1
+            if construct.docstring:
+                with_docstrings += 1
 
         return {
             "total_constructs": len(constructs),
-            "functions": sum(1 for c in constructs if c.type == ConstructType.FUNCTION),
-            "methods": sum(1 for c in constructs if c.type == ConstructType.METHOD),
-            "classes": sum(1 for c in constructs if c.type == ConstructType.CLASS),
-            "modules": sum(1 for c in constructs if c.type == ConstructType.MODULE),
-            "with_docstrings": sum(1 for c in constructs if c.docstring),
-            "without_docstrings": sum(1 for c in constructs if not c.docstring),
+            "functions": type_counts[ConstructType.FUNCTION],
+            "methods": type_counts[ConstructType.METHOD],
+            "classes": type_counts[ConstructType.CLASS],
+            "modules": type_counts[ConstructType.MODULE],
+            "with_docstrings": with_docstrings,
+            "without_docstrings": len(constructs) - with_docstrings,
         }
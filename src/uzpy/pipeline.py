@@ -13,7 +13,8 @@ from typing import Any  # Optional removed
 from loguru import logger
 
 from uzpy.analyzer import CachedAnalyzer, ModernHybridAnalyzer, ParallelAnalyzer
-from uzpy.discovery import FileDiscovery, discover_files
+from uzpy.analyzer.name_prefilter import find_files_mentioning
+from uzpy.discovery import discover_files
 from uzpy.modifier import LibCSTModifier, SafeLibCSTModifier
 
 # Import base implementations for default fallback
@@ -21,6 +22,40 @@ from uzpy.parser import TreeSitterParser
 from uzpy.types import Construct, Reference
 
 
+def create_modifier(ref_path: Path, safe_mode: bool = False) -> Any:
+    """
+    Build the docstring modifier for a reference path.
+
+    Relative paths in "Used in:" sections are computed against the
+    reference directory (or the directory of a single reference file).
+    Callers that run the pipeline repeatedly, like watch mode, can build
+    one modifier here and pass it to every run as `modifier_instance`.
+    (Declared Any: the two modifier classes share no base class.)
+
+    Used in:
+    - pipeline.py
+    - src/uzpy/cli_modern.py
+    """
+    project_root = ref_path.parent if ref_path.is_file() else ref_path
+    if safe_mode:
+        return SafeLibCSTModifier(project_root)
+    return LibCSTModifier(project_root)
+
+
+def _close_quietly(resource: Any) -> None:
+    """
+    Close a parser or analyzer if it has a close method, logging instead of raising on failure.
+
+    Used in:
+    - pipeline.py
+    """
+    if hasattr(resource, "close") and callable(resource.close):
+        try:
+            resource.close()
+        except Exception as e:
+            logger.warning(f"Error closing {type(resource).__name__}: {e}")
+
+
 def run_analysis_and_modification(
     edit_path: Path,
     ref_path: Path,
@@ -29,6 +64,8 @@ def run_analysis_and_modification(
     safe_mode: bool = False,
     parser_instance: Any | None = None,
     analyzer_instance: Any | None = None,
+    *,
+    modifier_instance: Any | None = None,
 ) -> dict[Construct, list[Reference]]:
     """
     Orchestrates the full uzpy pipeline: discovery, parsing, analysis,
@@ -44,6 +81,13 @@ def run_analysis_and_modification(
                          If None, a default TreeSitterParser is used.
         analyzer_instance: Optional pre-configured analyzer instance.
                            If None, a default HybridAnalyzer is used.
+        modifier_instance: Optional modifier from `create_modifier`, reused
+                           across runs. If None, a new one is built for
+                           this run.
+
+    Raises:
+        ValueError: If `modifier_instance` is a LibCSTModifier or
+            SafeLibCSTModifier that does not match `safe_mode`.
 
     Returns:
         Dictionary mapping constructs to their usage references
@@ -57,48 +101,75 @@ def run_analysis_and_modification(
     - tests/test_cli.py
     - uzpy/cli.py
     """
-    # Step 1: Discover files
-    logger.info("Discovering files...")
-    try:
-        edit_files, ref_files_paths = discover_files(edit_path, ref_path, exclude_patterns)
-    except Exception as e:
-        logger.error(f"Error discovering files: {e}")
-        raise
-
-    if not edit_files:
-        logger.warning("No Python files found in edit path.")
-        return {}
-
-    if not ref_files_paths:  # Note: discover_files returns list of Paths
-        logger.warning("No Python files found in reference path.")
-        return {}
-
-    logger.info(f"Found {len(edit_files)} edit files and {len(ref_files_paths)} reference files.")
-
-    # Step 2: Parse constructs
-    logger.info("Parsing edit files for constructs...")
+    # A modifier built for the other mode would silently override safe_mode
+    if isinstance(modifier_instance, (LibCSTModifier, SafeLibCSTModifier)) and (
+        isinstance(modifier_instance, SafeLibCSTModifier) != safe_mode
+    ):
+        msg = f"modifier_instance is a {type(modifier_instance).__name__}, which does not match safe_mode={safe_mode}"
+        raise ValueError(msg)
 
     # Use provided parser instance or default to TreeSitterParser
     parser = parser_instance if parser_instance else TreeSitterParser()
     logger.debug(f"Using parser: {type(parser).__name__}")
 
-    all_constructs: list[Construct] = []
-    for i, edit_file_path in enumerate(edit_files):
-        logger.debug(f"Parsing file {i + 1}/{len(edit_files)}: {edit_file_path}")
+    # The parser is only needed up to the end of parsing; close it on every way out
+    try:
+        # Step 1: Discover files
+        logger.info("Discovering files...")
         try:
-            constructs_in_file = parser.parse_file(edit_file_path)
-            all_constructs.extend(constructs_in_file)
-            logger.debug(f"Found {len(constructs_in_file)} constructs in {edit_file_path}")
+            edit_files, ref_files_paths = discover_files(edit_path, ref_path, exclude_patterns)
         except Exception as e:
-            logger.error(f"Failed to parse {edit_file_path}: {e}", exc_info=True)
-            continue  # Continue with other files
+            logger.error(f"Error discovering files: {e}")
+            raise
+
+        if not edit_files:
+            logger.warning("No Python files found in edit path.")
+            return {}
+
+        if not ref_files_paths:  # Note: discover_files returns list of Paths
+            logger.warning("No Python files found in reference path.")
+            return {}
+
+        logger.info(f"Found {len(edit_files)} edit files and {len(ref_files_paths)} reference files.")
 
-    if not all_constructs:
-        logger.warning("No constructs found in edit files after parsing.")
-        return {}
+        # Step 2: Parse constructs
+        logger.info("Parsing edit files for constructs...")
+
+        all_constructs: list[Construct] = []
+        if hasattr(parser, "parse_files") and callable(parser.parse_files):
+            # Batch-capable parsers spread the files over worker processes
+            for constructs_in_file in parser.parse_files(edit_files).values():
+                all_constructs.extend(constructs_in_file)
+        else:
+            for i, edit_file_path in enumerate(edit_files):
+                logger.debug(f"Parsing file {i + 1}/{len(edit_files)}: {edit_file_path}")
+                try:
+                    constructs_in_file = parser.parse_file(edit_file_path)
+                    all_constructs.extend(constructs_in_file)
+                    logger.debug(f"Found {len(constructs_in_file)} constructs in {edit_file_path}")
+                except Exception as e:
+                    logger.error(f"Failed to parse {edit_file_path}: {e}", exc_info=True)
+                    continue  # Continue with other files
+
+        if not all_constructs:
+            logger.warning("No constructs found in edit files after parsing.")
+            return {}
+    finally:
+        _close_quietly(parser)
+
+    # Nothing past this point reads Construct.node, and each node keeps its whole
+    # syntax tree alive; drop them so parsed trees are freed before analysis
+    for construct in all_constructs:
+        construct.release_node()
 
     logger.info(f"Successfully parsed {len(all_constructs)} total constructs from {len(edit_files)} files.")
 
+    # Equal constructs (same file, line and name) would only be analyzed twice
+    unique_constructs = list(dict.fromkeys(all_constructs))
+    if len(unique_constructs) < len(all_constructs):
+        logger.info(f"Deduplicated to {len(unique_constructs)} unique constructs.")
+        all_constructs = unique_constructs
+
     # Step 3: Analyze usages
     logger.info("Finding references...")
     try:
@@ -115,70 +186,74 @@ def run_analysis_and_modification(
         logger.error(f"Failed to initialize analyzer: {e}")
         raise
 
-    # Get all reference files for analysis
-    file_discovery = FileDiscovery(exclude_patterns)
-    ref_files = list(file_discovery.find_python_files(ref_path))
-
-    # Batch-analyze every construct against the reference files.
-    usage_results = analyzer.analyze_batch(all_constructs, ref_files)
-
-    # Summary of analysis results
-    constructs_with_refs = sum(1 for refs in usage_results.values() if refs)
-    total_references_found = sum(len(refs) for refs in usage_results.values())
-    logger.info(f"Analysis complete. Found usages for {constructs_with_refs}/{len(all_constructs)} constructs.")
-    logger.info(f"Total references found: {total_references_found}.")
-
-    # Step 4: Modify docstrings (if not dry_run)
-    if not dry_run:
-        logger.info("Updating docstrings with found references...")
-        try:
-            # Determine project_root for LibCSTModifier for relative path generation in docstrings
-            # This should be the common ancestor or the main project directory being analyzed.
-            # Using ref_path's parent (if file) or itself (if dir) is a common heuristic.
-            project_root_for_modifier = ref_path.parent if ref_path.is_file() else ref_path
-
-            # Use safe modifier if requested (declared Any: branches assign different concrete classes)
-            modifier: Any
-            if safe_mode:
-                logger.info("Using SafeLibCSTModifier to prevent syntax corruption")
-                modifier = SafeLibCSTModifier(project_root_for_modifier)
-            else:
-                modifier = LibCSTModifier(project_root_for_modifier)
-
-            modification_results = modifier.modify_files(usage_results)
-
-            successful_modifications = sum(1 for success in modification_results.values() if success)
-            total_files_processed_for_modification = len(modification_results)
-
-            if successful_modifications > 0:
-                logger.info(
-                    f"Successfully updated {successful_modifications}/{total_files_processed_for_modification} files."
-                )
-            elif total_files_processed_for_modification > 0:  # Files were processed but none needed changes
-                logger.info(
-                    f"{total_files_processed_for_modification} files processed, "
-                    "but no docstring updates were necessary."
-                )
-            else:  # No files were relevant for modification based on usage_results
-                logger.info("No files identified for docstring modification.")
-
-        except Exception as e:
-            logger.error(f"Failed to apply modifications to docstrings: {e}", exc_info=True)
-            # Decide if this should re-raise or just log. For now, just log.
-    else:
-        logger.info("Dry run mode active - no files were modified.")
-
-    # Close parser and analyzer if they have close methods (e.g., for releasing resources)
-    if hasattr(parser, "close") and callable(parser.close):
-        try:
-            parser.close()
-        except Exception as e:
-            logger.warning(f"Error closing parser {type(parser).__name__}: {e}")
-
-    if hasattr(analyzer, "close") and callable(analyzer.close):
-        try:
-            analyzer.close()
-        except Exception as e:
-            logger.warning(f"Error closing analyzer {type(analyzer).__name__}: {e}")
+    try:
+        # Batch-analyze every construct against the reference files found in Step 1, so
+        # batch-capable analyzers can share work across constructs.
+        usage_results: dict[Construct, list[Reference]]
+        if hasattr(analyzer, "analyze_batch") and callable(analyzer.analyze_batch):
+            usage_results = analyzer.analyze_batch(all_constructs, ref_files_paths)
+        else:
+            usage_results = {}
+            # Only files mentioning a construct's name can reference it
+            candidate_paths = find_files_mentioning({c.name for c in all_constructs}, ref_files_paths)
+            for construct in all_constructs:
+                if not candidate_paths[construct.name]:
+                    usage_results[construct] = []
+                    continue
+                try:
+                    usage_results[construct] = analyzer.find_usages(construct, candidate_paths[construct.name])
+                except Exception as e:
+                    logger.error(f"Failed to analyze {construct.full_name}: {e}")
+                    usage_results[construct] = []
+
+        # Many references point into the same file, and references built in worker
+        # processes each carry their own Path copy; keep one Path object per file.
+        path_cache: dict[Path, Path] = {}
+        for refs in usage_results.values():
+            for ref in refs:
+                ref.file_path = path_cache.setdefault(ref.file_path, ref.file_path)
+
+        # Summary of analysis results
+        constructs_with_refs = 0
+        total_references_found = 0
+        for refs in usage_results.values():
+            if refs:
+                constructs_with_refs += 1
+                total_references_found += len(refs)
+        logger.info(f"Analysis complete. Found usages for {constructs_with_refs}/{len(all_constructs)} constructs.")
+        logger.info(f"Total references found: {total_references_found}.")
+
+        # Step 4: Modify docstrings (if not dry_run)
+        if not dry_run:
+            logger.info("Updating docstrings with found references...")
+            try:
+                modifier = modifier_instance if modifier_instance is not None else create_modifier(ref_path, safe_mode)
+                if isinstance(modifier, SafeLibCSTModifier):
+                    logger.info("Using SafeLibCSTModifier to prevent syntax corruption")
+
+                modification_results = modifier.modify_files(usage_results)
+
+                successful_modifications = sum(1 for success in modification_results.values() if success)
+                total_files_processed_for_modification = len(modification_results)
+
+                if successful_modifications > 0:
+                    logger.info(
+                        f"Successfully updated {successful_modifications}/{total_files_processed_for_modification} files."
+                    )
+                elif total_files_processed_for_modification > 0:  # Files were processed but none needed changes
+                    logger.info(
+                        f"{total_files_processed_for_modification} files processed, "
+                        "but no docstring updates were necessary."
+                    )
+                else:  # No files were relevant for modification based on usage_results
+                    logger.info("No files identified for docstring modification.")
+
+            except Exception as e:
+                logger.error(f"Failed to apply modifications to docstrings: {e}", exc_info=True)
+                # Decide if this should re-raise or just log. For now, just log.
+        else:
+            logger.info("Dry run mode active - no files were modified.")
+    finally:
+        _close_quietly(analyzer)
 
-    return usage_results  # type: ignore[no-any-return]  # analyzer is Any (duck-typed pluggable stack)
+    return usage_results
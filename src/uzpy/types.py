@@ -7,10 +7,12 @@ This module contains all the core data transfer objects used throughout
 the application.
 """
 
-from dataclasses import dataclass
+import inspect
+import sys
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING  # Optional removed
+from typing import TYPE_CHECKING, Any  # Optional removed
 
 if TYPE_CHECKING:
     from tree_sitter import Node
@@ -48,7 +50,30 @@ class ConstructType(Enum):
     MODULE = "module"
 
 
-@dataclass
+def trim_docstring(docstring: str) -> str:
+    """
+    Trim the text of a docstring (without its quotes) as PEP 257 describes.
+
+    Used in:
+    - parser/tree_sitter_parser.py
+    - types.py
+    """
+    # Single-line docstrings have no indentation to remove
+    if "\n" not in docstring:
+        return docstring.strip()
+
+    # inspect.cleandoc expands tabs; remove the margin by hand instead so tabs are kept as written
+    if "\t" in docstring:
+        lines = docstring.split("\n")
+        margin = min((len(line) - len(line.lstrip()) for line in lines[1:] if line.strip()), default=0)
+        lines = [lines[0]] + [line[margin:] if line.strip() else line for line in lines[1:]]
+        return "\n".join(lines).strip()
+
+    # Remove common leading indentation
+    return inspect.cleandoc(docstring).strip()
+
+
+@dataclass(slots=True)
 class Construct:
     """
     Represents a Python construct (function, class, method, module) with
@@ -103,7 +128,12 @@ class Construct:
     line_number: int
     docstring: str | None
     full_name: str
-    node: "Node | None" = None  # Keep reference to tree-sitter node
+    # Tree-sitter node; keeps the file's whole syntax tree alive until released
+    node: "Node | None" = field(default=None, repr=False, compare=False)
+    # Identity used by __hash__/__eq__, computed once; the identifying fields
+    # (name, type, file_path, line_number, full_name) must not change afterwards
+    _key: tuple[str, ConstructType, str, int, str] = field(init=False, repr=False, compare=False)
+    _hash: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Clean up docstring formatting after initialization.
@@ -113,6 +143,52 @@ class Construct:
         """
         if self.docstring:
             self.docstring = self._clean_docstring(self.docstring)
+        self._set_identity()
+
+    def _set_identity(self) -> None:
+        """Intern the names, then compute the identity tuple and its hash.
+
+        Names repeat across constructs (methods like __init__, constructs
+        unpickled from worker processes), so interning shares one string.
+
+        Used in:
+        - types.py
+        """
+        self.name = sys.intern(self.name)
+        self.full_name = sys.intern(self.full_name)
+        self._key = (self.name, self.type, str(self.file_path), self.line_number, self.full_name)
+        self._hash = hash(self._key)
+
+    def release_node(self) -> None:
+        """Drop the tree-sitter node so its syntax tree can be freed.
+
+        Used in:
+        - pipeline.py
+        """
+        self.node = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle the data fields only.
+
+        String hashes are salted per process, so the cached hash is rebuilt
+        on unpickling rather than carried across to another process. The
+        tree-sitter node cannot be pickled and is left out as well.
+
+        Used in:
+        - types.py
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init and f.name != "node"}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the data fields and recompute the identity.
+
+        Used in:
+        - types.py
+        """
+        self.node = None
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._set_identity()
 
     def _clean_docstring(self, docstring: str) -> str:
         """
@@ -130,21 +206,7 @@ class Construct:
         elif docstring.startswith(('"', "'")):
             docstring = docstring[1:-1]
 
-        # Remove common leading indentation
-        lines = docstring.split("\n")
-        if len(lines) > 1:
-            # Find minimum indentation (excluding empty lines)
-            min_indent = float("inf")
-            for line in lines[1:]:  # Skip first line
-                if line.strip():
-                    indent = len(line) - len(line.lstrip())
-                    min_indent = min(min_indent, indent)
-
-            # Remove common indentation
-            if min_indent != float("inf"):
-                lines = [lines[0]] + [line[int(min_indent) :] if line.strip() else line for line in lines[1:]]
-
-        return "\n".join(lines).strip()
+        return trim_docstring(docstring)
 
     def __hash__(self) -> int:
         """Make Construct hashable based on unique identifying attributes.
@@ -152,7 +214,7 @@ class Construct:
         Used in:
         - types.py
         """
-        return hash((self.name, self.type, str(self.file_path), self.line_number, self.full_name))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
         """Compare constructs based on unique identifying attributes.
@@ -162,16 +224,10 @@ class Construct:
         """
         if not isinstance(other, Construct):
             return False
-        return (
-            self.name == other.name
-            and self.type == other.type
-            and self.file_path == other.file_path
-            and self.line_number == other.line_number
-            and self.full_name == other.full_name
-        )
+        return self._hash == other._hash and self._key == other._key
 
 
-@dataclass
+@dataclass(slots=True)
 class Reference:
     """
     Represents a reference to a construct found in the codebase.
@@ -9,11 +9,16 @@ modifications, deletions). When relevant changes are detected (e.g., to .py file
 it triggers a callback function, typically to re-run analysis.
 """
 
+import functools
+import os
+import stat
 import sys  # Added for __main__ example
 import threading  # Added for Timer
+import time
 from collections.abc import Callable
 from pathlib import Path
 
+import pathspec
 from loguru import logger
 from rich.console import Console  # Added for __main__ example
 from watchdog.events import (
@@ -30,6 +35,14 @@ from watchdog.events import (
 )
 from watchdog.observers import Observer
 
+from uzpy.discovery import FileDiscovery, compile_exclude_matcher
+
+# Event paths whose relevance is remembered; editors and formatters keep touching the same files
+_RELEVANCE_CACHE_SIZE = 8192
+
+# Case variants of the Python suffix, so event paths are filtered without lowercasing a copy
+_PY_SUFFIXES = (".py", ".PY", ".Py", ".pY")
+
 
 class UzpyWatcher(FileSystemEventHandler):
     """
@@ -43,6 +56,7 @@ class UzpyWatcher(FileSystemEventHandler):
         watch_paths: list[Path],  # Corrected type hint
         exclude_patterns: list[str],  # Corrected type hint
         debounce_interval: float = 1.0,
+        max_batch_window: float = 5.0,
     ):
         """
         Initialize the UzpyWatcher.
@@ -51,89 +65,207 @@ class UzpyWatcher(FileSystemEventHandler):
             callback: Function to call when relevant file changes are detected.
                       It will be called with a set of modified/created/deleted relevant file paths.
             watch_paths: A list of Path objects to monitor.
-            exclude_patterns: A list of glob patterns to ignore. (Handled by FileDiscovery logic)
+            exclude_patterns: A list of glob patterns to ignore, on top of FileDiscovery's defaults.
             debounce_interval: Time in seconds to wait for more changes before triggering callback.
+                      A change arriving after a quiet period of this length is reported at once.
+            max_batch_window: Upper bound in seconds on how long a continuous burst of changes
+                      can hold back the callback.
         """
         super().__init__()
         self.callback = callback
         self.watch_paths = [p.resolve() for p in watch_paths]  # Ensure absolute paths
+        # String forms of the roots so events are matched by prefix instead of walking Path.parents
+        self._watch_root_strs = [(str(p), str(p).rstrip(os.sep) + os.sep) for p in self.watch_paths]
+        self._relevance_cached = functools.lru_cache(maxsize=_RELEVANCE_CACHE_SIZE)(self._compute_relevance)
         self.exclude_patterns = exclude_patterns
         self.debounce_interval = debounce_interval
+        self.max_batch_window = max_batch_window
 
-        self._changed_files: set[Path] = set()
+        self._changed_files: set[str] = set()  # Resolved path strings; turned into Paths once per batch
+        # Raw event path -> resolved path, kept for one batch since a save emits several events per file
+        self._resolve_cache: dict[str, str] = {}
         self._debounce_lock = threading.Lock()
-        self._timer: threading.Timer | None = None
+        self._debounce_cv = threading.Condition(self._debounce_lock)
+        self._deadline: float | None = None  # Monotonic time at which pending changes are flushed
+        self._flush_now = False  # The pending deadline is a leading-edge flush that must not be pushed back
+        self._last_fire = float("-inf")
+        self._batch_started = 0.0
+        self._closed = False
+        # One long-lived thread waits for the deadline instead of a new Timer thread per event
+        self._debounce_thread = threading.Thread(target=self._debounce_loop, name="uzpy-debounce", daemon=True)
+        self._debounce_thread.start()
 
         logger.info(f"UzpyWatcher initialized. Debounce interval: {self.debounce_interval}s.")
         logger.debug(f"Watching paths: {[str(p) for p in self.watch_paths]}")
 
+    @property
+    def exclude_patterns(self) -> list[str]:
+        """Extra glob patterns to ignore, on top of FileDiscovery's defaults."""
+        return self._exclude_patterns
+
+    @exclude_patterns.setter
+    def exclude_patterns(self, patterns: list[str]) -> None:
+        self._exclude_patterns = patterns
+        # Compiled once here; events are matched against it without recompiling
+        self._is_excluded = compile_exclude_matcher(
+            pathspec.PathSpec.from_lines("gitwildmatch", [*FileDiscovery.DEFAULT_EXCLUDE_PATTERNS, *patterns])
+        )
+        self._relevance_cached.cache_clear()
+
     def _is_relevant_file(self, file_path_str: str) -> bool:
-        """Check if the file is a Python file and not excluded."""
+        """Check if the file is a Python file and not excluded, remembering the answer per event path."""
         if not file_path_str:
             return False
-        file_path = Path(file_path_str)
-        if file_path.suffix.lower() == ".py":
-            is_watched = any(
-                watch_root in file_path.resolve().parents or watch_root == file_path.resolve()
-                for watch_root in self.watch_paths
-            )
-            if is_watched:
-                return True
+        return self._relevance_cached(file_path_str)
+
+    def _compute_relevance(self, file_path_str: str) -> bool:
+        """Uncached relevance check behind `_is_relevant_file`."""
+        if not file_path_str.endswith(_PY_SUFFIXES):
+            return False
+        # Event paths stay strings here: abspath is purely lexical (Path.resolve would
+        # hit the filesystem), and watchdog reports paths under the resolved roots it
+        # was scheduled on
+        abs_path = os.path.abspath(file_path_str)  # noqa: PTH100
+        for root_str, root_prefix in self._watch_root_strs:
+            if abs_path == root_str:
+                return not self._is_excluded(os.path.basename(abs_path))  # noqa: PTH119
+            if abs_path.startswith(root_prefix):
+                return not self._is_excluded(abs_path[len(root_prefix) :])
         return False
 
-    def _trigger_callback(self) -> None:
-        """Triggers the callback with collected file paths."""
-        with self._debounce_lock:
-            if self._changed_files:
-                logger.info(f"Debounce triggered. Processing {len(self._changed_files)} changed files.")
-                try:
-                    self.callback(self._changed_files.copy())
-                except Exception as e:
-                    logger.error(f"Error in watcher callback: {e}", exc_info=True)
-                self._changed_files.clear()
-            self._timer = None  # Reset timer
+    def _debounce_loop(self) -> None:
+        """Wait for each flush deadline and hand the batched changes to the callback."""
+        with self._debounce_cv:
+            while not self._closed:
+                if self._deadline is None:
+                    self._debounce_cv.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._debounce_cv.wait(timeout=remaining)
+                    continue
+                self._trigger_callback_locked()
+
+    def _trigger_callback_locked(self) -> None:
+        """Triggers the callback with collected file paths. Caller holds `_debounce_lock`."""
+        changed_files = self._changed_files
+        self._changed_files = set()
+        self._resolve_cache.clear()
+        self._deadline = None
+        self._flush_now = False
+        if changed_files:
+            logger.info(f"Debounce triggered. Processing {len(changed_files)} changed files.")
+            # Run the callback unlocked so events arriving meanwhile queue up for the next batch
+            self._debounce_lock.release()
+            try:
+                self.callback({Path(path_str) for path_str in changed_files})
+            except Exception as e:
+                logger.error(f"Error in watcher callback: {e}", exc_info=True)
+            finally:
+                self._debounce_lock.acquire()
+        self._last_fire = time.monotonic()
+
+    def _schedule_callback_locked(self, *, is_first_change: bool) -> None:
+        """
+        Move the flush deadline after a change was queued. Caller holds `_debounce_lock`.
+
+        The first change after a quiet period fires right away; later changes are
+        debounced, but never beyond `max_batch_window` from the start of the batch.
+        """
+        now = time.monotonic()
+        if is_first_change:
+            self._batch_started = now
+            if now - self._last_fire > self.debounce_interval:
+                delay = 0.0
+                self._flush_now = True
+            else:
+                delay = self.debounce_interval
+        elif self._flush_now:
+            return  # The pending immediate flush will pick this change up too
+        else:
+            delay = min(self.debounce_interval, max(0.0, self._batch_started + self.max_batch_window - now))
+
+        self._deadline = now + delay
+        self._debounce_cv.notify()
+        logger.debug(f"Debounce deadline set {delay:.2f}s ahead.")
+
+    def close(self) -> None:
+        """Stop the debounce thread. Changes still pending are dropped."""
+        with self._debounce_cv:
+            self._closed = True
+            self._debounce_cv.notify()
+        self._debounce_thread.join()
+
+    def _resolve(self, path_str: str) -> str:
+        """Resolve an event path, reusing the result for repeated events within the current batch."""
+        resolved = self._resolve_cache.get(path_str)
+        if resolved is None:
+            resolved = self._resolve_cache[path_str] = os.path.realpath(path_str)
+        return resolved
 
     def _handle_event(self, event: FileSystemEvent) -> None:
         """Generic event handler for file system events."""
         if event.is_directory:
             return
+        self._handle_paths(event.event_type, getattr(event, "src_path", None))
 
-        file_path_str = getattr(event, "src_path", None)
-        if not file_path_str:  # Also handle dest_path for moves
-            file_path_str = getattr(event, "dest_path", None)
-
-        if not file_path_str:
+    def _handle_paths(self, event_type: str, *path_strs: str | None) -> None:
+        """Queue the relevant paths among `path_strs` and (re)arm the timer once for all of them."""
+        relevant = [path_str for path_str in path_strs if path_str and self._is_relevant_file(path_str)]
+        if not relevant:
             return
 
-        if self._is_relevant_file(file_path_str):
-            logger.debug(f"Relevant file event: {event.event_type} on {file_path_str}")
-            with self._debounce_lock:
-                self._changed_files.add(Path(file_path_str).resolve())
-                if self._timer:
-                    self._timer.cancel()
-                self._timer = threading.Timer(self.debounce_interval, self._trigger_callback)
-                self._timer.start()
-                logger.debug(f"Debounce timer (re)started for {self.debounce_interval}s.")
+        for path_str in relevant:
+            logger.debug(f"Relevant file event: {event_type} on {path_str}")
+        resolved = [self._resolve(path_str) for path_str in relevant]
+        with self._debounce_cv:
+            is_first_change = not self._changed_files
+            self._changed_files.update(resolved)
+            self._schedule_callback_locked(is_first_change=is_first_change)
 
     def on_modified(self, event: DirModifiedEvent | FileModifiedEvent) -> None:
-        super().on_modified(event)
         self._handle_event(event)
 
     def on_created(self, event: DirCreatedEvent | FileCreatedEvent) -> None:
-        super().on_created(event)
         self._handle_event(event)
 
     def on_deleted(self, event: DirDeletedEvent | FileDeletedEvent) -> None:
-        super().on_deleted(event)
         self._handle_event(event)
 
     def on_moved(self, event: DirMovedEvent | FileMovedEvent) -> None:
-        super().on_moved(event)
-        # A move involves a source (deleted) and destination (created)
-        # Handle both if they are relevant Python files
-        # FileSystemEvent itself doesn't make src_path/dest_path part of its direct attributes for _handle_event
-        # So, we pass event and let _handle_event extract src_path or dest_path
-        self._handle_event(event)
+        if event.is_directory:
+            return
+        # A move deletes the source and creates the destination; both sides matter
+        self._handle_paths(event.event_type, getattr(event, "src_path", None), getattr(event, "dest_path", None))
+
+
+def _outermost_watch_paths(paths: list[Path]) -> list[tuple[Path, bool]]:
+    """
+    Resolve `paths` and drop duplicates and paths inside another watched directory.
+
+    Each scheduled path gets its own watchdog emitter (an inotify instance and
+    thread on Linux), and a recursive watch on a directory already covers
+    everything below it. Missing paths are logged and skipped.
+
+    Returns:
+        `(resolved_path, is_dir)` pairs, from a single stat per path.
+    """
+    resolved: dict[Path, bool] = {}
+    for path in paths:
+        try:
+            mode = path.stat().st_mode
+        except OSError:
+            logger.warning(f"Watcher: Path does not exist, cannot watch: {path}")
+            continue
+        resolved[path.resolve()] = stat.S_ISDIR(mode)
+
+    outermost: list[tuple[Path, bool]] = []
+    for path in sorted(resolved, key=lambda p: len(p.parts)):
+        if any(is_dir and root in path.parents for root, is_dir in outermost):
+            logger.debug(f"Watcher: {path} is already covered by a watched directory")
+            continue
+        outermost.append((path, resolved[path]))
+    return outermost
 
 
 class WatcherOrchestrator:
@@ -153,6 +285,7 @@ class WatcherOrchestrator:
         self.exclude_patterns = exclude_patterns
         self.debounce_interval = debounce_interval
         self.observer = Observer()
+        self._event_handler: UzpyWatcher | None = None
 
     def start(self) -> None:
         """Starts the file system watcher."""
@@ -166,15 +299,15 @@ class WatcherOrchestrator:
             exclude_patterns=self.exclude_patterns,
             debounce_interval=self.debounce_interval,
         )
+        self._event_handler = event_handler
 
-        for path in self.paths_to_watch:
-            if path.exists():
-                self.observer.schedule(event_handler, str(path.resolve()), recursive=path.is_dir())
-                logger.info(f"Watcher scheduled for path: {path.resolve()} (recursive: {path.is_dir()})")
-            else:
-                logger.warning(f"Watcher: Path does not exist, cannot watch: {path}")
+        for path, is_dir in _outermost_watch_paths(self.paths_to_watch):
+            self.observer.schedule(event_handler, str(path), recursive=is_dir)
+            logger.info(f"Watcher scheduled for path: {path} (recursive: {is_dir})")
         if not self.observer.emitters:
             logger.error("Watcher: No valid paths found to watch. Observer not started.")
+            event_handler.close()
+            self._event_handler = None
             return
 
         self.observer.start()
@@ -193,6 +326,9 @@ class WatcherOrchestrator:
             self.observer.stop()
             logger.info("Watcher stopping...")
         self.observer.join()
+        if self._event_handler is not None:
+            self._event_handler.close()
+            self._event_handler = None
         logger.info("File system watcher stopped.")
 
 
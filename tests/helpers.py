@@ -0,0 +1,18 @@
+# this_file: tests/helpers.py
+
+"""
+Plain helper functions shared by test modules.
+"""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+
+def python_files(directory: Path) -> Iterator[Path]:
+    """Yield the .py files under directory without descending into __pycache__."""
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        for name in files:
+            if name.endswith(".py"):
+                yield Path(root) / name
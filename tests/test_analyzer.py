@@ -4,19 +4,20 @@
 Tests for the analyzer functionality.
 """
 
-import tempfile
 from pathlib import Path
 
 import pytest
 
 from uzpy.analyzer.hybrid_analyzer import HybridAnalyzer
+from uzpy.analyzer.name_prefilter import find_files_mentioning
+from uzpy.analyzer.parallel_analyzer import ParallelAnalyzer
 from uzpy.parser import Construct, ConstructType
 
 
-@pytest.fixture
-def sample_project():
-    """Create a sample project structure for testing."""
-    project_dir = Path(tempfile.mkdtemp())
+@pytest.fixture(scope="module")
+def sample_project(tmp_path_factory):
+    """Create a sample project structure for testing, shared read-only by the module's tests."""
+    project_dir = tmp_path_factory.mktemp("sample_project")
 
     # Create main module
     main_content = '''"""Main module."""
@@ -70,17 +71,18 @@ class UnusedClass:
     (project_dir / "utils.py").write_text(utils_content)
     (project_dir / "models.py").write_text(models_content)
 
-    yield project_dir
+    return project_dir
 
-    # Cleanup
-    import shutil
 
-    shutil.rmtree(project_dir)
+@pytest.fixture(scope="module")
+def analyzer(sample_project):
+    """Build one HybridAnalyzer for the shared sample project; it indexes the project on creation."""
+    return HybridAnalyzer(sample_project)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_constructs(sample_project):
-    """Create sample constructs for testing."""
+    """Create sample constructs for testing, shared by the module's tests (which do not modify them)."""
     return [
         Construct(
             name="helper_function",
@@ -117,17 +119,21 @@ def sample_constructs(sample_project):
     ]
 
 
-def test_hybrid_analyzer_initialization(sample_project):
+@pytest.fixture(scope="module")
+def batch_results(sample_project, analyzer, sample_constructs):
+    """Analyze all sample constructs against main.py once for the tests that inspect the batch result."""
+    return analyzer.analyze_batch(sample_constructs, [sample_project / "main.py"])
+
+
+def test_hybrid_analyzer_initialization(sample_project, analyzer):
     """Test HybridAnalyzer initialization."""
-    analyzer = HybridAnalyzer(sample_project)
     assert analyzer.project_path == sample_project
     assert analyzer.rope_analyzer is not None
     assert analyzer.jedi_analyzer is not None
 
 
-def test_find_usages_with_results(sample_project, sample_constructs):
+def test_find_usages_with_results(sample_project, analyzer, sample_constructs):
     """Test finding usages for constructs that are actually used."""
-    analyzer = HybridAnalyzer(sample_project)
 
     # Test helper_function which is imported and called in main.py
     helper_construct = sample_constructs[0]  # helper_function
@@ -143,9 +149,8 @@ def test_find_usages_with_results(sample_project, sample_constructs):
     assert sample_project / "main.py" in ref_files_found
 
 
-def test_find_usages_no_results(sample_project, sample_constructs):
+def test_find_usages_no_results(sample_project, analyzer, sample_constructs):
     """Test finding usages for constructs that are not used."""
-    analyzer = HybridAnalyzer(sample_project)
 
     # Test unused_function which is not referenced anywhere
     unused_construct = sample_constructs[2]  # unused_function
@@ -157,9 +162,8 @@ def test_find_usages_no_results(sample_project, sample_constructs):
     assert len(references) == 0
 
 
-def test_find_usages_class(sample_project, sample_constructs):
+def test_find_usages_class(sample_project, analyzer, sample_constructs):
     """Test finding usages for class constructs."""
-    analyzer = HybridAnalyzer(sample_project)
 
     # Test UserClass which is imported and instantiated in main.py
     user_class = sample_constructs[1]  # UserClass
@@ -171,12 +175,10 @@ def test_find_usages_class(sample_project, sample_constructs):
     assert len(references) > 0
 
 
-def test_analyze_multiple_constructs(sample_project, sample_constructs):
+def test_analyze_multiple_constructs(batch_results, sample_constructs):
     """Test analyzing multiple constructs at once."""
-    analyzer = HybridAnalyzer(sample_project)
 
-    ref_files = [sample_project / "main.py"]
-    results = analyzer.analyze_batch(sample_constructs, ref_files)
+    results = batch_results
 
     # Should return a dictionary mapping constructs to references
     assert isinstance(results, dict)
@@ -197,12 +199,10 @@ def test_analyze_multiple_constructs(sample_project, sample_constructs):
     assert len(results[unused_class]) == 0
 
 
-def test_analyzer_statistics(sample_project, sample_constructs):
+def test_analyzer_statistics(batch_results, sample_constructs):
     """Test analyzer statistics generation."""
-    analyzer = HybridAnalyzer(sample_project)
 
-    ref_files = [sample_project / "main.py"]
-    results = analyzer.analyze_batch(sample_constructs, ref_files)
+    results = batch_results
 
     # Calculate basic statistics from results
     stats = {
@@ -222,9 +222,8 @@ def test_analyzer_statistics(sample_project, sample_constructs):
     assert stats["constructs_without_usages"] > 0
 
 
-def test_analyzer_with_nonexistent_files(sample_project, sample_constructs):
+def test_analyzer_with_nonexistent_files(analyzer, sample_constructs):
     """Test analyzer behavior with non-existent reference files."""
-    analyzer = HybridAnalyzer(sample_project)
 
     # Try to analyze with non-existent file
     ref_files = [Path("/nonexistent/file.py")]
@@ -236,9 +235,8 @@ def test_analyzer_with_nonexistent_files(sample_project, sample_constructs):
     assert len(references) == 0
 
 
-def test_analyzer_reference_attributes(sample_project, sample_constructs):
+def test_analyzer_reference_attributes(sample_project, analyzer, sample_constructs):
     """Test that references include required attributes."""
-    analyzer = HybridAnalyzer(sample_project)
 
     helper_construct = sample_constructs[0]  # helper_function
     ref_files = [sample_project / "main.py"]
@@ -275,14 +273,11 @@ def test_analyzer_error_handling():
     assert len(references) == 0
 
 
-def test_analyzer_performance_tracking(sample_project, sample_constructs):
+def test_analyzer_performance_tracking(batch_results):
     """Test that analyzer tracks performance metrics."""
-    analyzer = HybridAnalyzer(sample_project)
-
-    ref_files = [sample_project / "main.py"]
 
     # Analyze constructs and check if timing information is available
-    results = analyzer.analyze_batch(sample_constructs, ref_files)
+    results = batch_results
 
     # The analyzer should complete without errors
     assert isinstance(results, dict)
@@ -290,3 +285,56 @@ def test_analyzer_performance_tracking(sample_project, sample_constructs):
     # Performance tracking should be implemented in the analyzer
     # This is a placeholder for future performance tracking features
     assert True  # Placeholder assertion
+
+
+def test_name_prefilter(sample_project):
+    """Test that the prefilter maps names to the files mentioning them as identifiers."""
+    files = [sample_project / "main.py", sample_project / "utils.py", sample_project / "models.py"]
+    mentions = find_files_mentioning(["helper_function", "UnusedClass", "Unused", "missing"], files)
+
+    assert mentions["helper_function"] == [sample_project / "main.py", sample_project / "utils.py"]
+    assert mentions["UnusedClass"] == [sample_project / "models.py"]
+    # Substrings of longer identifiers (UnusedClass) do not count
+    assert mentions["Unused"] == []
+    assert mentions["missing"] == []
+
+
+def test_parallel_analyzer_sequential_path_skips_unmentioned(sample_project, sample_constructs):
+    """Test that constructs mentioned in no reference file never reach the wrapped analyzer."""
+
+    class RecordingAnalyzer:
+        def __init__(self):
+            self.calls = {}
+
+        def find_usages(self, construct, search_paths):
+            self.calls[construct.name] = search_paths
+            return []
+
+    recorder = RecordingAnalyzer()
+    ref_files = [sample_project / "main.py"]
+    results = ParallelAnalyzer(recorder, num_workers=1).analyze_batch(sample_constructs, ref_files)
+
+    assert set(results) == set(sample_constructs)
+    assert recorder.calls == {"helper_function": ref_files, "UserClass": ref_files}
+
+
+def test_parallel_analyzer_sequential_batch_gets_narrowed_paths(sample_project, sample_constructs):
+    """Test that a wrapped analyze_batch only sees the files mentioning each construct's name."""
+
+    class RecordingBatchAnalyzer:
+        def __init__(self):
+            self.calls = {}
+
+        def analyze_batch(self, constructs, search_paths):
+            for construct in constructs:
+                self.calls[construct.name] = search_paths
+            return {construct: [] for construct in constructs}
+
+    recorder = RecordingBatchAnalyzer()
+    files = [sample_project / "main.py", sample_project / "utils.py", sample_project / "models.py"]
+    mentions = find_files_mentioning([c.name for c in sample_constructs], files)
+    results = ParallelAnalyzer(recorder, num_workers=1).analyze_batch(sample_constructs, files)
+
+    assert set(results) == set(sample_constructs)
+    assert recorder.calls == {name: paths for name, paths in mentions.items() if paths}
+    assert all(len(paths) < len(files) for paths in recorder.calls.values())
@@ -4,18 +4,17 @@
 Tests for the modern CLI module.
 """
 
-import tempfile
-from pathlib import Path
+import shutil
 
 import pytest
 
-from uzpy.pipeline import run_analysis_and_modification
+from uzpy.pipeline import create_modifier, run_analysis_and_modification
 
 
-@pytest.fixture
-def sample_project():
-    """Create a sample project for testing CLI."""
-    project_dir = Path(tempfile.mkdtemp())
+@pytest.fixture(scope="module")
+def sample_project(tmp_path_factory):
+    """Create a sample project for testing CLI, shared read-only by the module's tests."""
+    project_dir = tmp_path_factory.mktemp("sample_project")
 
     # Create a simple Python file
     content = '''"""Sample module."""
@@ -34,12 +33,14 @@ class SampleClass:
 
     (project_dir / "sample.py").write_text(content)
 
-    yield project_dir
+    return project_dir
 
-    # Cleanup
-    import shutil
 
-    shutil.rmtree(project_dir)
+@pytest.fixture
+def mutable_project(sample_project, tmp_path):
+    """Copy of the sample project for tests that add files to it."""
+    shutil.copytree(sample_project, tmp_path, dirs_exist_ok=True)
+    return tmp_path
 
 
 def test_modern_cli_analysis(sample_project):
@@ -67,15 +68,15 @@ def test_modern_cli_single_file(sample_project):
     assert isinstance(result, dict)
 
 
-def test_modern_cli_with_exclusions(sample_project):
+def test_modern_cli_with_exclusions(mutable_project):
     """Test modern CLI with exclude patterns."""
     # Create additional files to exclude
-    (sample_project / "test_file.py").write_text("# Test file")
-    (sample_project / "__pycache__").mkdir()
-    (sample_project / "__pycache__" / "cache.pyc").write_text("cache")
+    (mutable_project / "test_file.py").write_text("# Test file")
+    (mutable_project / "__pycache__").mkdir()
+    (mutable_project / "__pycache__" / "cache.pyc").write_text("cache")
 
-    edit_path = sample_project
-    ref_path = sample_project
+    edit_path = mutable_project
+    ref_path = mutable_project
     exclude_patterns = ["test_*", "__pycache__/*"]
     dry_run = True
 
@@ -84,10 +85,10 @@ def test_modern_cli_with_exclusions(sample_project):
     assert isinstance(result, dict)
 
 
-def test_modern_cli_with_reference_files(sample_project):
+def test_modern_cli_with_reference_files(mutable_project):
     """Test modern CLI with different reference path."""
     # Create a separate reference directory
-    ref_dir = sample_project / "ref"
+    ref_dir = mutable_project / "ref"
     ref_dir.mkdir()
     (ref_dir / "reference.py").write_text(
         """
@@ -96,11 +97,60 @@ hello_world()
 """
     )
 
-    edit_path = sample_project / "sample.py"
-    ref_path = sample_project
+    edit_path = mutable_project / "sample.py"
+    ref_path = mutable_project
     exclude_patterns = []
     dry_run = True
 
     # Should run without errors
     result = run_analysis_and_modification(edit_path, ref_path, exclude_patterns, dry_run)
     assert isinstance(result, dict)
+
+
+def test_pipeline_uses_given_modifier(mutable_project):
+    """Test that a modifier passed in by the caller is used instead of a new one."""
+
+    class RecordingModifier:
+        def __init__(self):
+            self.calls = []
+
+        def modify_files(self, usage_results):
+            self.calls.append(usage_results)
+            return {}
+
+    modifier = RecordingModifier()
+    for _ in range(2):
+        result = run_analysis_and_modification(
+            mutable_project, mutable_project, [], dry_run=False, modifier_instance=modifier
+        )
+        assert isinstance(result, dict)
+
+    assert len(modifier.calls) == 2
+
+
+def test_pipeline_closes_parser_on_early_return(tmp_path):
+    """Test that the parser is closed even when there is nothing to parse."""
+
+    class ClosingParser:
+        closed = False
+
+        def parse_file(self, file_path):
+            return []
+
+        def close(self):
+            self.closed = True
+
+    parser = ClosingParser()
+    assert run_analysis_and_modification(tmp_path, tmp_path, [], dry_run=True, parser_instance=parser) == {}
+    assert parser.closed
+
+
+@pytest.mark.parametrize("safe_mode", [True, False])
+def test_pipeline_rejects_modifier_for_other_mode(mutable_project, safe_mode):
+    """Test that a modifier built for the other safe_mode is refused instead of silently used."""
+    modifier = create_modifier(mutable_project, safe_mode=not safe_mode)
+
+    with pytest.raises(ValueError, match="safe_mode"):
+        run_analysis_and_modification(
+            mutable_project, mutable_project, [], dry_run=False, safe_mode=safe_mode, modifier_instance=modifier
+        )
@@ -16,14 +16,84 @@ from uzpy.modifier.libcst_modifier import LibCSTModifier
 from uzpy.parser import Construct, ConstructType, Reference
 
 
+def _example_usage_map(reference_path: str) -> dict[Construct, list[Reference]]:
+    """Map the `example` function in test.py to a single reference from `reference_path`."""
+    construct = Construct(
+        name="example",
+        type=ConstructType.FUNCTION,
+        file_path=Path("test.py"),
+        line_number=1,
+        docstring=None,
+        full_name="example",
+    )
+    reference = Reference(
+        file_path=Path(reference_path),
+        line_number=10,
+    )
+    return {construct: [reference]}
+
+
+# Docstring quoting edge cases that must come out of modification as valid Python
+_QUOTING_EDGE_CASES = {
+    "triple_quote_in_docstring": dedent('''
+        def example():
+            """This docstring contains \\"\\"\\" escaped triple quotes."""
+            pass
+    ''').strip(),
+    "escaped_quotes_in_docstring": dedent(r'''
+        def example():
+            """This docstring has \"escaped\" quotes and \n newlines."""
+            pass
+    ''').strip(),
+    "single_quote_docstring": dedent("""
+        def example():
+            'Single quoted docstring'
+            pass
+    """).strip(),
+    "multiline_string_with_quotes": dedent('''
+        def example():
+            """
+            This is a complex docstring with:
+            - 'Single quotes'
+            - "Double quotes"
+            - \\"\\"\\" escaped triple quotes
+            - Escaped backslash: \\\\n
+            """
+            pass
+    ''').strip(),
+    "nested_quotes_edge_case": dedent('''
+        def example():
+            """This has \\"\\"\\" and \\'\\'\\' and mixed quotes."""
+            pass
+    ''').strip(),
+    "docstring_with_code_blocks": dedent('''
+        def example():
+            """
+            Example function.
+
+            Example:
+                >>> print("Hello")
+                'Hello'
+                >>> data = {"key": 'value'}
+            """
+            pass
+    ''').strip(),
+}
+
+
 class TestCorruptionPrevention:
     """Test cases to prevent Python syntax corruption."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def modifier(self):
-        """Create a LibCST modifier instance."""
+        """Create a LibCST modifier instance shared by the class's tests."""
         return LibCSTModifier(project_root=Path.cwd())
 
+    @pytest.fixture(scope="class")
+    def usage_map(self):
+        """Usage map with `example` referenced from other.py."""
+        return _example_usage_map("other.py")
+
     def verify_valid_python(self, code: str) -> bool:
         """Verify that code is valid Python syntax."""
         try:
@@ -32,113 +102,9 @@ class TestCorruptionPrevention:
         except SyntaxError:
             return False
 
-    def test_triple_quote_in_docstring(self, modifier):
-        """Test handling of triple quotes within docstrings."""
-        code = dedent('''
-            def example():
-                """This docstring contains \\"\\"\\" escaped triple quotes."""
-                pass
-        ''').strip()
-
-        # Create usage map
-        construct = Construct(
-            name="example",
-            type=ConstructType.FUNCTION,
-            file_path=Path("test.py"),
-            line_number=1,
-            docstring=None,
-            full_name="example",
-        )
-        reference = Reference(
-            file_path=Path("other.py"),
-            line_number=10,
-        )
-        usage_map = {construct: [reference]}
-
-        # Modify the code
-        result = modifier.modify_string(code, Path("test.py"), usage_map)
-
-        # Verify syntax is still valid
-        assert self.verify_valid_python(result), f"Invalid Python syntax:\n{result}"
-
-    def test_escaped_quotes_in_docstring(self, modifier):
-        """Test handling of escaped quotes in docstrings."""
-        code = dedent(r'''
-            def example():
-                """This docstring has \"escaped\" quotes and \n newlines."""
-                pass
-        ''').strip()
-
-        construct = Construct(
-            name="example",
-            type=ConstructType.FUNCTION,
-            file_path=Path("test.py"),
-            line_number=1,
-            docstring=None,
-            full_name="example",
-        )
-        reference = Reference(
-            file_path=Path("other.py"),
-            line_number=10,
-        )
-        usage_map = {construct: [reference]}
-
-        result = modifier.modify_string(code, Path("test.py"), usage_map)
-        assert self.verify_valid_python(result), f"Invalid Python syntax:\n{result}"
-
-    def test_single_quote_docstring(self, modifier):
-        """Test handling of single-quoted docstrings."""
-        code = dedent("""
-            def example():
-                'Single quoted docstring'
-                pass
-        """).strip()
-
-        construct = Construct(
-            name="example",
-            type=ConstructType.FUNCTION,
-            file_path=Path("test.py"),
-            line_number=1,
-            docstring=None,
-            full_name="example",
-        )
-        reference = Reference(
-            file_path=Path("other.py"),
-            line_number=10,
-        )
-        usage_map = {construct: [reference]}
-
-        result = modifier.modify_string(code, Path("test.py"), usage_map)
-        assert self.verify_valid_python(result), f"Invalid Python syntax:\n{result}"
-
-    def test_multiline_string_with_quotes(self, modifier):
-        """Test handling of complex multiline strings with mixed quotes."""
-        code = dedent('''
-            def example():
-                """
-                This is a complex docstring with:
-                - 'Single quotes'
-                - "Double quotes"
-                - \\"\\"\\" escaped triple quotes
-                - Escaped backslash: \\\\n
-                """
-                pass
-        ''').strip()
-
-        construct = Construct(
-            name="example",
-            type=ConstructType.FUNCTION,
-            file_path=Path("test.py"),
-            line_number=1,
-            docstring=None,
-            full_name="example",
-        )
-        reference = Reference(
-            file_path=Path("other.py"),
-            line_number=10,
-        )
-        usage_map = {construct: [reference]}
-
+    @pytest.mark.parametrize("code", _QUOTING_EDGE_CASES.values(), ids=_QUOTING_EDGE_CASES.keys())
+    def test_quoting_edge_cases(self, modifier, usage_map, code):
+        """Test that docstrings with tricky quoting stay valid Python after modification."""
         result = modifier.modify_string(code, Path("test.py"), usage_map)
         assert self.verify_valid_python(result), f"Invalid Python syntax:\n{result}"
 
@@ -156,19 +122,7 @@ class TestCorruptionPrevention:
                 pass
         ''').strip()
 
-        construct = Construct(
-            name="example",
-            type=ConstructType.FUNCTION,
-            file_path=Path("test.py"),
-            line_number=1,
-            docstring=None,
-            full_name="example",
-        )
-        reference = Reference(
-            file_path=Path("new/file.py"),
-            line_number=10,
-        )
-        usage_map = {construct: [reference]}
+        usage_map = _example_usage_map("new/file.py")
 
         result = modifier.modify_string(code, Path("test.py"), usage_map)
         assert self.verify_valid_python(result), f"Invalid Python syntax:\n{result}"
@@ -176,27 +130,13 @@ class TestCorruptionPrevention:
         assert "old/file.py" in result
         assert "new/file.py" in result
 
-    def test_no_docstring_function(self, modifier):
+    def test_no_docstring_function(self, modifier, usage_map):
         """Test adding docstring to function without one."""
         code = dedent("""
             def example():
                 pass
         """).strip()
 
-        construct = Construct(
-            name="example",
-            type=ConstructType.FUNCTION,
-            file_path=Path("test.py"),
-            line_number=1,
-            docstring=None,
-            full_name="example",
-        )
-        reference = Reference(
-            file_path=Path("other.py"),
-            line_number=10,
-        )
-        usage_map = {construct: [reference]}
-
         result = modifier.modify_string(code, Path("test.py"), usage_map)
         assert self.verify_valid_python(result), f"Invalid Python syntax:\n{result}"
         assert '"""' in result or "'''" in result  # Should add a docstring
@@ -235,63 +175,6 @@ class TestCorruptionPrevention:
         # Should not add "Used in:" for same-file reference
         assert "Used in:" not in result
 
-    def test_nested_quotes_edge_case(self, modifier):
-        """Test extreme edge case with nested quote patterns."""
-        code = dedent('''
-            def example():
-                """This has \\"\\"\\" and \\'\\'\\' and mixed quotes."""
-                pass
-        ''').strip()
-
-        construct = Construct(
-            name="example",
-            type=ConstructType.FUNCTION,
-            file_path=Path("test.py"),
-            line_number=1,
-            docstring=None,
-            full_name="example",
-        )
-        reference = Reference(
-            file_path=Path("other.py"),
-            line_number=10,
-        )
-        usage_map = {construct: [reference]}
-
-        result = modifier.modify_string(code, Path("test.py"), usage_map)
-        assert self.verify_valid_python(result), f"Invalid Python syntax:\n{result}"
-
-    def test_docstring_with_code_blocks(self, modifier):
-        """Test docstrings containing code examples with quotes."""
-        code = dedent('''
-            def example():
-                """
-                Example function.
-
-                Example:
-                    >>> print("Hello")
-                    'Hello'
-                    >>> data = {"key": 'value'}
-                """
-                pass
-        ''').strip()
-
-        construct = Construct(
-            name="example",
-            type=ConstructType.FUNCTION,
-            file_path=Path("test.py"),
-            line_number=1,
-            docstring=None,
-            full_name="example",
-        )
-        reference = Reference(
-            file_path=Path("other.py"),
-            line_number=10,
-        )
-        usage_map = {construct: [reference]}
-
-        result = modifier.modify_string(code, Path("test.py"), usage_map)
-        assert self.verify_valid_python(result), f"Invalid Python syntax:\n{result}"
-
 
 class TestRegressionPrevention:
     """Tests to prevent regression of previously fixed issues."""
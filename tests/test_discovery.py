@@ -4,32 +4,39 @@
 Tests for file discovery functionality.
 """
 
-import tempfile
+import shutil
 from pathlib import Path
 
+import pathspec
 import pytest
 
-from uzpy.discovery import FileDiscovery, discover_files
+from uzpy.discovery import FileDiscovery, compile_exclude_matcher, discover_files
 
 
-@pytest.fixture
-def temp_project():
-    """Create a temporary project structure for testing."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        root = Path(tmp_dir)
+@pytest.fixture(scope="module")
+def temp_project(tmp_path_factory):
+    """Create a temporary project structure for testing, shared read-only by the module's tests."""
+    root = tmp_path_factory.mktemp("temp_project")
+
+    # Create test files
+    (root / "main.py").write_text("# Main module")
+    (root / "utils.py").write_text("# Utilities")
+    (root / "tests").mkdir()
+    (root / "tests" / "test_main.py").write_text("# Tests")
+    (root / "__pycache__").mkdir()
+    (root / "__pycache__" / "main.cpython-312.pyc").write_text("compiled")
+    (root / ".git").mkdir()
+    (root / ".git" / "config").write_text("git config")
+    (root / "README.md").write_text("# README")
 
-        # Create test files
-        (root / "main.py").write_text("# Main module")
-        (root / "utils.py").write_text("# Utilities")
-        (root / "tests").mkdir()
-        (root / "tests" / "test_main.py").write_text("# Tests")
-        (root / "__pycache__").mkdir()
-        (root / "__pycache__" / "main.cpython-312.pyc").write_text("compiled")
-        (root / ".git").mkdir()
-        (root / ".git" / "config").write_text("git config")
-        (root / "README.md").write_text("# README")
+    return root
 
-        yield root
+
+@pytest.fixture
+def mutable_project(temp_project, tmp_path):
+    """Copy of the temporary project for tests that add files to it."""
+    shutil.copytree(temp_project, tmp_path, dirs_exist_ok=True)
+    return tmp_path
 
 
 def test_file_discovery_basic(temp_project):
@@ -76,36 +83,36 @@ def test_discover_files_function(temp_project):
     assert edit_files == ref_files  # Same path for both
 
 
-def test_custom_exclude_patterns(temp_project):
+def test_custom_exclude_patterns(mutable_project):
     """Test custom exclude patterns."""
     # Create a file that should be excluded
-    (temp_project / "secret.py").write_text("# Secret file")
+    (mutable_project / "secret.py").write_text("# Secret file")
 
     discovery = FileDiscovery(exclude_patterns=["secret.py"])
-    files = list(discovery.find_python_files(temp_project))
+    files = list(discovery.find_python_files(mutable_project))
 
     file_names = {f.name for f in files}
     assert "secret.py" not in file_names
     assert "main.py" in file_names  # Other files still found
 
 
-def test_private_folder_exclusion(temp_project):
+def test_private_folder_exclusion(mutable_project):
     """Test that _private folder exclusion works correctly."""
     # Create _private folder with files
-    private_dir = temp_project / "_private"
+    private_dir = mutable_project / "_private"
     private_dir.mkdir()
     (private_dir / "secret.py").write_text("# Private secret file")
     (private_dir / "config.py").write_text("# Private config file")
 
     # Create a normal file
-    (temp_project / "public.py").write_text("# Public file")
+    (mutable_project / "public.py").write_text("# Public file")
 
     # Test with _private pattern
     discovery = FileDiscovery(exclude_patterns=["_private"])
-    files = list(discovery.find_python_files(temp_project))
+    files = list(discovery.find_python_files(mutable_project))
 
     file_names = {f.name for f in files}
-    relative_paths = {f.relative_to(temp_project) for f in files}
+    relative_paths = {f.relative_to(mutable_project) for f in files}
 
     # Should not find files in _private folder
     assert "secret.py" not in file_names
@@ -120,10 +127,10 @@ def test_private_folder_exclusion(temp_project):
         assert not str(path).startswith("_private")
 
 
-def test_private_folder_exclusion_glob_pattern(temp_project):
+def test_private_folder_exclusion_glob_pattern(mutable_project):
     """Test that _private/** folder exclusion works correctly."""
     # Create _private folder with files
-    private_dir = temp_project / "_private"
+    private_dir = mutable_project / "_private"
     private_dir.mkdir()
     (private_dir / "secret.py").write_text("# Private secret file")
 
@@ -133,14 +140,14 @@ def test_private_folder_exclusion_glob_pattern(temp_project):
     (private_subdir / "deep_secret.py").write_text("# Deep private file")
 
     # Create a normal file
-    (temp_project / "public.py").write_text("# Public file")
+    (mutable_project / "public.py").write_text("# Public file")
 
     # Test with _private/** pattern
     discovery = FileDiscovery(exclude_patterns=["_private/**"])
-    files = list(discovery.find_python_files(temp_project))
+    files = list(discovery.find_python_files(mutable_project))
 
     file_names = {f.name for f in files}
-    relative_paths = {f.relative_to(temp_project) for f in files}
+    relative_paths = {f.relative_to(mutable_project) for f in files}
 
     # Should not find files in _private folder
     assert "secret.py" not in file_names
@@ -153,3 +160,25 @@ def test_private_folder_exclusion_glob_pattern(temp_project):
     # Check no paths start with _private
     for path in relative_paths:
         assert not str(path).startswith("_private")
+
+
+@pytest.mark.parametrize("extra_patterns", [["_private/**", "*.tmp.py", "docs/"], ["*.py", "!keep.py"]])
+def test_compile_exclude_matcher_agrees_with_pathspec(extra_patterns):
+    """Test that the fused matcher gives the same answers as PathSpec, with and without negations."""
+    spec = pathspec.PathSpec.from_lines("gitwildmatch", FileDiscovery.DEFAULT_EXCLUDE_PATTERNS + extra_patterns)
+    matcher = compile_exclude_matcher(spec)
+    paths = [
+        "main.py",
+        "keep.py",
+        "pkg/build/mod.py",
+        "build/mod.py",
+        "pkg/__pycache__/x.pyc",
+        "_private/sub/secret.py",
+        "pkg/_private/secret.py",
+        "a/b.tmp.py",
+        "docs/conf.py",
+        "pkg/docs/conf.py",
+        "/abs/.venv/lib.py",
+        ".venv/lib.py",
+    ]
+    assert [matcher(p) for p in paths] == [spec.match_file(p) for p in paths]
@@ -4,17 +4,17 @@
 Tests for the LibCST modifier functionality.
 """
 
-import tempfile
 from pathlib import Path
 
 import pytest
 
 from uzpy.modifier.libcst_modifier import DocstringModifier, LibCSTModifier
+from uzpy.modifier.safe_modifier import SafeLibCSTModifier
 from uzpy.parser import Construct, ConstructType, Reference
 
 
 @pytest.fixture
-def sample_python_file_with_docstrings():
+def sample_python_file_with_docstrings(tmp_path):
     """Create a sample Python file with existing docstrings for testing."""
     content = '''"""Module docstring."""
 
@@ -46,13 +46,9 @@ def function_without_docstring():
     return 42
 '''
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-        f.write(content)
-        f.flush()
-        yield Path(f.name)
-
-    # Cleanup
-    Path(f.name).unlink()
+    path = tmp_path / "sample_module.py"
+    path.write_text(content)
+    return path
 
 
 @pytest.fixture
@@ -251,8 +247,7 @@ def test_modify_file_integration(sample_python_file_with_docstrings, sample_cons
     modifier = LibCSTModifier(project_root)
 
     # Read original content
-    with open(sample_python_file_with_docstrings) as f:
-        f.read()
+    original_content = sample_python_file_with_docstrings.read_text()
 
     # Modify the file
     success = modifier.modify_file(sample_python_file_with_docstrings, usage_map)
@@ -260,10 +255,10 @@ def test_modify_file_integration(sample_python_file_with_docstrings, sample_cons
     assert success is True
 
     # Read modified content
-    with open(sample_python_file_with_docstrings) as f:
-        modified_content = f.read()
+    modified_content = sample_python_file_with_docstrings.read_text()
 
     # Should have added usage information
+    assert modified_content != original_content
     assert "Used in:" in modified_content
     assert "src/main.py" in modified_content
     assert "tests/test_module.py" in modified_content
@@ -289,6 +284,105 @@ def test_modify_files_batch(sample_python_file_with_docstrings, sample_construct
     assert results[file_key] is True
 
 
+def test_modify_string_is_repeatable(sample_python_file_with_docstrings, sample_constructs_and_references):
+    """Test that transforming the same source twice with one modifier gives the same result."""
+    _, usage_map = sample_constructs_and_references
+    modifier = LibCSTModifier(sample_python_file_with_docstrings.parent)
+    source = sample_python_file_with_docstrings.read_text()
+
+    first = modifier.modify_string(source, sample_python_file_with_docstrings, usage_map)
+    second = modifier.modify_string(source, sample_python_file_with_docstrings, usage_map)
+
+    assert first != source
+    assert second == first
+
+
+@pytest.fixture
+def batch_usage_map(tmp_path):
+    """Ten one-function modules in tmp_path, each referenced from caller.py; enough for worker processes."""
+    usage_map = {}
+    for i in range(10):
+        path = tmp_path / f"module_{i}.py"
+        path.write_text(f'def function_{i}():\n    """Function {i}."""\n    return {i}\n')
+        construct = Construct(
+            name=f"function_{i}",
+            type=ConstructType.FUNCTION,
+            file_path=path,
+            line_number=1,
+            docstring=f"Function {i}.",
+            full_name=f"function_{i}",
+        )
+        usage_map[construct] = [Reference(file_path=tmp_path / "caller.py", line_number=i + 1)]
+    return usage_map
+
+
+def test_modify_files_in_worker_processes(tmp_path, batch_usage_map):
+    """Test that batches large enough for worker processes are transformed and written like serial ones."""
+    modifier = LibCSTModifier(tmp_path)
+    expected = {
+        construct.file_path: modifier.modify_string(
+            construct.file_path.read_text(), construct.file_path, batch_usage_map
+        )
+        for construct in batch_usage_map
+    }
+
+    results = modifier.modify_files(batch_usage_map, num_workers=2)
+
+    assert list(results) == [str(path) for path in expected]
+    assert all(results.values())
+    for path, content in expected.items():
+        assert "- caller.py" in content
+        assert path.read_text() == content
+
+
+def test_safe_modify_files_in_worker_processes(tmp_path, batch_usage_map):
+    """Test that the safe modifier's batch API modifies every file and leaves no backups behind."""
+    results = SafeLibCSTModifier(tmp_path).modify_files(batch_usage_map, num_workers=2)
+
+    assert list(results) == [str(construct.file_path) for construct in batch_usage_map]
+    assert all(results.values())
+    for construct in batch_usage_map:
+        assert "- caller.py" in construct.file_path.read_text()
+    assert not list(tmp_path.glob("*.bak"))
+
+
+def test_safe_modifier_shares_reference_paths_across_files(tmp_path):
+    """Test that the safe modifier resolves a reference file once for all the files it modifies."""
+    modifier = SafeLibCSTModifier(tmp_path)
+    caller = tmp_path / "caller.py"
+    for name in ("first", "second"):
+        path = tmp_path / f"{name}.py"
+        path.write_text(f'def {name}():\n    """Do {name}."""\n')
+        construct = Construct(
+            name=name, type=ConstructType.FUNCTION, file_path=path, line_number=1, docstring=None, full_name=name
+        )
+        assert modifier.modify_file(path, {construct: [Reference(file_path=caller, line_number=3)]})
+        assert "- caller.py" in path.read_text()
+
+    assert modifier._path_cache == {caller: (caller.resolve(), "caller.py")}
+
+
+def test_modifiers_write_the_same_reference_paths(tmp_path):
+    """Test that safe and normal mode write the same slash-separated Used in: entry."""
+    caller = tmp_path / "pkg" / "caller.py"
+    contents = []
+    for modifier_cls in (LibCSTModifier, SafeLibCSTModifier):
+        path = tmp_path / "target.py"
+        path.write_text('def target():\n    """Do it."""\n')
+        construct = Construct(
+            name="target",
+            type=ConstructType.FUNCTION,
+            file_path=path,
+            line_number=1,
+            docstring=None,
+            full_name="target",
+        )
+        assert modifier_cls(tmp_path).modify_file(path, {construct: [Reference(file_path=caller, line_number=1)]})
+        contents.append(path.read_text())
+
+    assert all("- pkg/caller.py" in content for content in contents)
+
+
 def test_indentation_preservation():
     """Test that indentation is preserved correctly."""
     modifier = DocstringModifier({}, Path("/fake/project"))
@@ -343,43 +437,47 @@ def test_relative_path_calculation():
     assert "/fake/project/" not in result
 
 
-def test_error_handling_invalid_syntax():
+def test_error_handling_invalid_syntax(tmp_path):
     """Test error handling with invalid Python syntax."""
     content = """
 def broken_function(
     # Missing closing parenthesis
     return "broken"
 """
+    path = tmp_path / "broken.py"
+    path.write_text(content)
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-        f.write(content)
-        f.flush()
-
-        modifier = LibCSTModifier(Path("/fake"))
-        success = modifier.modify_file(Path(f.name), {})
+    # A referenced construct in the file, so the modifier actually has to parse it
+    construct = Construct(
+        name="broken_function",
+        type=ConstructType.FUNCTION,
+        file_path=path,
+        line_number=2,
+        docstring=None,
+        full_name="broken_function",
+    )
+    usage_map = {construct: [Reference(file_path=tmp_path / "caller.py", line_number=1)]}
 
-        # Should handle error gracefully
-        assert success is False
+    modifier = LibCSTModifier(tmp_path)
+    success = modifier.modify_file(path, usage_map)
 
-    Path(f.name).unlink()
+    # Should handle error gracefully
+    assert success is False
+    assert path.read_text() == content
 
 
-def test_no_changes_needed():
+def test_no_changes_needed(tmp_path):
     """Test behavior when no changes are needed."""
     content = '''def simple_function():
     """Simple function."""
     pass
 '''
+    path = tmp_path / "simple.py"
+    path.write_text(content)
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-        f.write(content)
-        f.flush()
-
-        modifier = LibCSTModifier(Path("/fake"))
-        # Pass empty usage map - no changes needed
-        success = modifier.modify_file(Path(f.name), {})
-
-        # Should report no changes made
-        assert success is False
+    modifier = LibCSTModifier(Path("/fake"))
+    # Pass empty usage map - no changes needed
+    success = modifier.modify_file(path, {})
 
-    Path(f.name).unlink()
+    # Should report no changes made
+    assert success is False
@@ -4,18 +4,18 @@
 Tests for the Tree-sitter parser functionality.
 """
 
-import tempfile
+import concurrent.futures
+import pickle
 from pathlib import Path
 
 import pytest
 
-from uzpy.parser import ConstructType, TreeSitterParser
+from uzpy.parser import CachedParser, ConstructType, TreeSitterParser
+from uzpy.parser import cached_parser as cached_parser_module
+from uzpy.parser import common as parser_common
 
-
-@pytest.fixture
-def sample_python_file():
-    """Create a sample Python file for testing."""
-    content = '''"""Module docstring for testing."""
+# Source of the sample module most parser tests run against
+_SAMPLE_SOURCE = b'''"""Module docstring for testing."""
 
 def standalone_function():
     """A standalone function."""
@@ -44,25 +44,29 @@ def another_function():
     pass
 '''
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-        f.write(content)
-        f.flush()
-        yield Path(f.name)
 
-    # Cleanup
-    Path(f.name).unlink()
+@pytest.fixture
+def sample_python_file(tmp_path):
+    """Create a sample Python file for testing."""
+    path = tmp_path / "sample.py"
+    path.write_bytes(_SAMPLE_SOURCE)
+    return path
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """Create one TreeSitterParser shared by the module's tests; parse_file keeps no per-call state."""
+    return TreeSitterParser()
 
 
-def test_parser_initialization():
+def test_parser_initialization(parser):
     """Test that the parser initializes correctly."""
-    parser = TreeSitterParser()
     assert parser.language is not None
     assert parser.parser is not None
 
 
-def test_parse_file_basic(sample_python_file):
+def test_parse_file_basic(parser, sample_python_file):
     """Test basic file parsing functionality."""
-    parser = TreeSitterParser()
     constructs = parser.parse_file(sample_python_file)
 
     # Should find module, classes, and functions/methods
@@ -76,9 +80,8 @@ def test_parse_file_basic(sample_python_file):
     assert ConstructType.METHOD in types_found
 
 
-def test_construct_extraction(sample_python_file):
+def test_construct_extraction(parser, sample_python_file):
     """Test detailed construct extraction."""
-    parser = TreeSitterParser()
     constructs = parser.parse_file(sample_python_file)
 
     # Build a map by name for easier testing
@@ -123,9 +126,33 @@ def test_construct_extraction(sample_python_file):
     assert func2.docstring is None
 
 
-def test_line_numbers(sample_python_file):
+def test_each_construct_reported_once(parser, sample_python_file):
+    """Test that methods are emitted once, as methods, and not also as functions."""
+    constructs = parser.parse_file(sample_python_file)
+
+    full_names = [c.full_name for c in constructs]
+    assert len(full_names) == len(set(full_names))
+    methods = [c for c in constructs if c.type == ConstructType.METHOD]
+    assert {m.full_name for m in methods} >= {"TestClass.method_one", "TestClass.method_two"}
+    assert all(c.type != ConstructType.FUNCTION for c in constructs if "." in c.full_name)
+
+
+def test_construct_pickle_roundtrip(parser, sample_python_file):
+    """Test that constructs survive pickling without carrying their cached hash or node."""
+    constructs = parser.parse_file(sample_python_file)
+    assert all(c.node is not None for c in constructs)
+
+    # Round-trips data this test just created, nothing untrusted is unpickled
+    restored = pickle.loads(pickle.dumps(constructs))  # noqa: S301
+
+    assert restored == constructs
+    assert all(c.node is None for c in restored)
+    assert {hash(c) for c in restored} == {hash(c) for c in constructs}
+    assert all("_hash" not in c.__getstate__() for c in constructs)
+
+
+def test_line_numbers(parser, sample_python_file):
     """Test that line numbers are correctly extracted."""
-    parser = TreeSitterParser()
     constructs = parser.parse_file(sample_python_file)
 
     by_name = {c.name: c for c in constructs}
@@ -143,9 +170,8 @@ def test_line_numbers(sample_python_file):
         assert construct.line_number > 0
 
 
-def test_parser_statistics(sample_python_file):
+def test_parser_statistics(parser, sample_python_file):
     """Test parser statistics functionality."""
-    parser = TreeSitterParser()
     stats = parser.get_statistics(sample_python_file)
 
     assert stats["total_constructs"] > 0
@@ -156,8 +182,46 @@ def test_parser_statistics(sample_python_file):
     assert stats["with_docstrings"] > 0
     assert stats["without_docstrings"] > 0
 
+    # Passing already-parsed constructs gives the same counts without a re-parse
+    assert parser.get_statistics(sample_python_file, parser.parse_file(sample_python_file)) == stats
+
+
+def test_docstring_must_be_first_statement(parser, tmp_path):
+    """Test that a string literal after the first statement is not taken as a docstring."""
+    path = tmp_path / "late_string.py"
+    path.write_text(
+        'import os\n"""Not a module docstring."""\n\n'
+        'def func():\n    # A comment is allowed first\n    """Real docstring."""\n\n'
+        'class Late:\n    x = 1\n    """Attribute docstring, not the class docstring."""\n'
+    )
+    constructs = {c.full_name: c for c in parser.parse_file(path)}
+
+    assert constructs["func"].docstring == "Real docstring."
+    assert constructs["Late"].docstring is None
+    module = next(c for c in constructs.values() if c.type == ConstructType.MODULE)
+    assert module.docstring is None
+
+
+def test_docstring_prefix_and_quotes_are_stripped(parser, tmp_path):
+    """Test that string prefixes and quotes never end up in the docstring text."""
+    path = tmp_path / "prefixed.py"
+    path.write_text('def raw():\n    r"""Match \\d+ digits."""\n\ndef quoted():\n    """\'Quoted\' at the start."""\n')
+    constructs = {c.full_name: c for c in parser.parse_file(path)}
+
+    assert constructs["raw"].docstring == "Match \\d+ digits."
+    assert constructs["quoted"].docstring == "'Quoted' at the start."
+
+
+def test_docstring_tabs_are_kept(parser, tmp_path):
+    """Test that tabs in a docstring survive trimming instead of being expanded."""
+    path = tmp_path / "tabbed.py"
+    path.write_text('def tabbed():\n    """Columns:\n\n    name\tvalue\n    \tindented\n    """\n')
+    constructs = {c.full_name: c for c in parser.parse_file(path)}
+
+    assert constructs["tabbed"].docstring == "Columns:\n\nname\tvalue\n\tindented"
 
-def test_parser_with_syntax_error():
+
+def test_parser_with_syntax_error(parser, tmp_path):
     """Test parser behavior with syntax errors."""
     content = '''
 def broken_function(
@@ -169,48 +233,262 @@ def good_function():
     return 42
 '''
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-        f.write(content)
-        f.flush()
+    path = tmp_path / "broken.py"
+    path.write_text(content)
+
+    constructs = parser.parse_file(path)
+
+    # Should still find some constructs despite syntax error
+    assert len(constructs) > 0
+
+    # Should find the good function
+    names = {c.name for c in constructs}
+    assert "good_function" in names
 
-        parser = TreeSitterParser()
-        constructs = parser.parse_file(Path(f.name))
 
-        # Should still find some constructs despite syntax error
-        assert len(constructs) > 0
+def test_parse_bytes_matches_parse_file(parser, sample_python_file):
+    """Test that parsing already-read bytes gives the same constructs as parsing the file."""
+    from_file = parser.parse_file(sample_python_file)
+    from_bytes = parser.parse_bytes(sample_python_file.read_bytes(), sample_python_file)
 
-        # Should find the good function
-        names = {c.name for c in constructs}
-        assert "good_function" in names
+    def summary(constructs):
+        return [(c.type, c.full_name, c.line_number, c.docstring) for c in constructs]
 
-    Path(f.name).unlink()
+    assert summary(from_bytes) == summary(from_file)
+    assert all(c.file_path == sample_python_file for c in from_bytes)
 
 
-def test_parser_empty_file():
+def test_parser_empty_file(parser, tmp_path):
     """Test parser with empty file."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-        f.write("")
-        f.flush()
+    path = tmp_path / "empty.py"
+    path.write_text("")
 
-        parser = TreeSitterParser()
-        constructs = parser.parse_file(Path(f.name))
+    constructs = parser.parse_file(path)
 
-        # Should at least find the module construct
-        assert len(constructs) >= 1
-        assert any(c.type == ConstructType.MODULE for c in constructs)
+    # Should at least find the module construct
+    assert len(constructs) >= 1
+    assert any(c.type == ConstructType.MODULE for c in constructs)
 
-    Path(f.name).unlink()
 
+def test_parser_threads_get_their_own_parser(sample_python_file):
+    """Test that one TreeSitterParser can be used from several threads."""
+    parser = TreeSitterParser()
+    expected = set(parser.parse_file(sample_python_file))
 
-def test_parser_nonexistent_file():
-    """Test parser with non-existent file."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: set(parser.parse_file(sample_python_file)), range(16)))
+        thread_parsers = set(executor.map(lambda _: id(parser.parser), range(16)))
+
+    assert all(result == expected for result in results)
+    assert id(parser.parser) not in thread_parsers
+
+
+def test_parser_parse_files(parser, tmp_path):
+    """Test batch parsing through worker processes."""
+    files = []
+    for i in range(10):
+        path = tmp_path / f"module_{i}.py"
+        path.write_text(f'class Widget{i}:\n    def run(self):\n        """Run {i}."""\n')
+        files.append(path)
+
+    results = parser.parse_files(files, num_workers=2)
+
+    assert list(results) == files
+    for path in files:
+        assert set(results[path]) == set(parser.parse_file(path))
+        assert all(c.node is None for c in results[path])
+
+
+def test_cached_parser_roundtrip(sample_python_file, tmp_path, monkeypatch):
+    """Test that cached constructs match a fresh parse."""
+    # The sample file is small; make sure it still goes through the disk cache
+    monkeypatch.setattr(CachedParser, "MIN_DISK_CACHE_SIZE", 0)
     parser = TreeSitterParser()
+    with CachedParser(TreeSitterParser(), tmp_path) as cached_parser:
+        first = cached_parser.parse_file(sample_python_file)
+        # Second call is served from the in-process fast path
+        assert set(cached_parser.parse_file(sample_python_file)) == set(first)
+
+    # A fresh instance has to load the results from disk
+    with CachedParser(TreeSitterParser(), tmp_path) as cached_parser:
+        second = cached_parser.parse_file(sample_python_file)
+
+    expected = {c.full_name: c for c in parser.parse_file(sample_python_file)}
+    assert set(first) == set(expected.values())
+    assert set(second) == set(expected.values())
+    assert {c.full_name: c.docstring for c in second} == {name: c.docstring for name, c in expected.items()}
+    assert all(c.node is None for c in second)
+
+
+def test_cached_parser_parse_files(tmp_path):
+    """Test batch parsing through worker processes and the cache."""
+    files = []
+    for i in range(10):
+        path = tmp_path / f"module_{i}.py"
+        path.write_text(f'def func_{i}():\n    """Function {i}."""\n    return {i}\n')
+        files.append(path)
+
+    with CachedParser(TreeSitterParser(), tmp_path / "cache") as cached_parser:
+        results = cached_parser.parse_files(files, num_workers=2)
+        # Everything is cached now, so no workers are needed the second time
+        again = cached_parser.parse_files(files, num_workers=2)
+
+    assert list(results) == files
+    for i, path in enumerate(files):
+        by_name = {c.name: c for c in results[path]}
+        assert by_name[f"func_{i}"].docstring == f"Function {i}."
+        assert set(again[path]) == set(results[path])
+
+
+def test_cached_parser_parse_files_spreads_misses_over_workers(tmp_path, monkeypatch):
+    """Test that a mid-sized batch of cache misses is split across every worker."""
+    pools = []
+
+    class RecordingPool(concurrent.futures.ThreadPoolExecutor):
+        def __init__(self, max_workers, initializer, initargs):
+            pools.append(max_workers)
+            super().__init__(max_workers=max_workers, initializer=initializer, initargs=initargs)
+
+    monkeypatch.setattr(parser_common.concurrent.futures, "ProcessPoolExecutor", RecordingPool)
+    files = []
+    for i in range(10):
+        path = tmp_path / f"module_{i}.py"
+        path.write_text(f"def func_{i}():\n    return {i}\n")
+        files.append(path)
+
+    with CachedParser(TreeSitterParser(), tmp_path / "cache") as cached_parser:
+        results = cached_parser.parse_files(files, num_workers=4)
+
+    assert list(results) == files
+    assert pools == [4]
+
+
+def _parse_entry_count(cached_parser):
+    """Count parse results in the disk cache, leaving out per-path content hashes."""
+    return sum(1 for key in cached_parser.cache.iterkeys() if key.startswith("parse_file:"))
+
+
+def test_cached_parser_parse_files_looks_up_each_miss_once(tmp_path, monkeypatch):
+    """Test that in-process misses are parsed without going through the cache lookups again."""
+    monkeypatch.setattr(CachedParser, "MIN_DISK_CACHE_SIZE", 0)
+    files = []
+    for i in range(3):
+        path = tmp_path / f"module_{i}.py"
+        path.write_text(f"def func_{i}():\n    return {i}\n")
+        files.append(path)
+
+    with CachedParser(TreeSitterParser(), tmp_path / "cache") as cached_parser:
+        lookups = []
+        get_cached = cached_parser._get_cached
+        monkeypatch.setattr(cached_parser, "_get_cached", lambda *args: lookups.append(args[0]) or get_cached(*args))
+        results = cached_parser.parse_files(files)
+
+        assert lookups == files
+        assert len(cached_parser.cache) > 0
+
+    assert list(results) == files
+
+
+def test_cached_parser_shares_entries_for_identical_files(sample_python_file, tmp_path, monkeypatch):
+    """Test that identical files in different places share one cache entry."""
+    monkeypatch.setattr(CachedParser, "MIN_DISK_CACHE_SIZE", 0)
+    content = sample_python_file.read_text()
+    copies = []
+    for folder in ("pkg_a", "pkg_b"):
+        (tmp_path / folder).mkdir()
+        path = tmp_path / folder / "vendored.py"
+        path.write_text(content)
+        copies.append(path)
+
+    with CachedParser(TreeSitterParser(), tmp_path / "cache") as cached_parser:
+        cached_parser.parse_file(copies[0])
+        assert _parse_entry_count(cached_parser) == 1
+
+    # A fresh instance serves the second copy from the first copy's entry
+    with CachedParser(TreeSitterParser(), tmp_path / "cache") as cached_parser:
+        loaded = cached_parser.parse_file(copies[1])
+        assert _parse_entry_count(cached_parser) == 1
+
+    expected = TreeSitterParser().parse_file(copies[1])
+    assert set(loaded) == set(expected)
+    assert all(c.file_path == copies[1] for c in loaded)
+    assert all(c.node is None for c in loaded)
+
+
+def test_cached_parser_reuses_content_hash_across_runs(sample_python_file, tmp_path, monkeypatch):
+    """Test that an unchanged file is not re-hashed by a later CachedParser."""
+    monkeypatch.setattr(CachedParser, "MIN_DISK_CACHE_SIZE", 0)
+    with CachedParser(TreeSitterParser(), tmp_path / "cache") as cached_parser:
+        first = cached_parser.parse_file(sample_python_file)
+
+    def fail_hasher(file_path, size):
+        msg = "content hash should come from the cache"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(cached_parser_module, "hash_file_content", fail_hasher)
+    with CachedParser(TreeSitterParser(), tmp_path / "cache") as cached_parser:
+        assert cached_parser.parse_file(sample_python_file) == first
+
+
+def test_cached_parser_skips_disk_for_small_files(tmp_path):
+    """Test that files below the size threshold are not written to the disk cache."""
+    small = tmp_path / "small.py"
+    small.write_text("def tiny():\n    pass\n")
+
+    with CachedParser(TreeSitterParser(), tmp_path / "cache") as cached_parser:
+        first = cached_parser.parse_file(small)
+        assert len(cached_parser.cache) == 0
+        # Still served from the in-process fast path
+        assert set(cached_parser.parse_file(small)) == set(first)
+
+
+def test_cached_parser_memory_cache_holds_no_nodes(sample_python_file, tmp_path):
+    """Test that the in-process fast path keeps neither syntax trees nor the caller's constructs."""
+    with CachedParser(TreeSitterParser(), tmp_path / "cache") as cached_parser:
+        first = cached_parser.parse_file(sample_python_file)
+        assert all(c.node is not None for c in first)
+
+        second = cached_parser.parse_file(sample_python_file)
+
+    assert second == first
+    assert all(c.node is None for c in second)
+    assert not any(a is b for a, b in zip(first, second, strict=True))
+
+
+def test_cached_parser_statistics_use_the_cache(sample_python_file, tmp_path, monkeypatch):
+    """Test that CachedParser.get_statistics parses through the cache instead of the wrapped parser."""
+    expected = TreeSitterParser().get_statistics(sample_python_file)
+    with CachedParser(TreeSitterParser(), tmp_path / "cache") as cached_parser:
+        cached_parser.parse_file(sample_python_file)
+
+        def fail_parse(file_path):
+            pytest.fail(f"{file_path} was parsed again")
+
+        monkeypatch.setattr(cached_parser.parser, "parse_file", fail_parse)
+
+        assert cached_parser.get_statistics(sample_python_file) == expected
+
+
+def test_cached_parser_memory_hits_are_independent(sample_python_file, tmp_path):
+    """Test that changing constructs from one lookup does not affect later lookups."""
+    with CachedParser(TreeSitterParser(), tmp_path / "cache") as cached_parser:
+        expected = [c.docstring for c in cached_parser.parse_file(sample_python_file)]
+
+        for _ in range(2):
+            for construct in cached_parser.parse_file(sample_python_file):
+                construct.docstring = "changed by caller"
+
+        assert [c.docstring for c in cached_parser.parse_file(sample_python_file)] == expected
+
+
+def test_parser_nonexistent_file(parser):
+    """Test parser with non-existent file."""
 
     with pytest.raises(FileNotFoundError):
         parser.parse_file(Path("/this/file/does/not/exist.py"))
 
 
-def test_parser_utf8_method_names():
+def test_parser_utf8_method_names(parser, tmp_path):
     """Test that method names are correctly extracted even with UTF-8 characters in the file.
 
     This tests the fix for the issue where method names were being truncated
@@ -244,27 +522,23 @@ class TestClass:
         pass
 '''
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False, encoding="utf-8") as f:
-        f.write(content)
-        f.flush()
-
-        parser = TreeSitterParser()
-        constructs = parser.parse_file(Path(f.name))
+    path = tmp_path / "utf8_methods.py"
+    path.write_text(content, encoding="utf-8")
 
-        # Find the methods
-        methods = [c for c in constructs if c.type == ConstructType.METHOD]
-        method_names = {c.name for c in methods}
+    constructs = parser.parse_file(path)
 
-        # Verify that method names are correctly extracted (not truncated)
-        assert "_compute_temporal_alignment" in method_names
-        assert "_log_compatibility" in method_names
+    # Find the methods
+    methods = [c for c in constructs if c.type == ConstructType.METHOD]
+    method_names = {c.name for c in methods}
 
-        # Verify no truncated names
-        truncated_names = [name for name in method_names if name.endswith("(") or "\n" in name]
-        assert len(truncated_names) == 0, f"Found truncated method names: {truncated_names}"
+    # Verify that method names are correctly extracted (not truncated)
+    assert "_compute_temporal_alignment" in method_names
+    assert "_log_compatibility" in method_names
 
-        # Verify full names are correct
-        temporal_method = next(c for c in methods if c.name == "_compute_temporal_alignment")
-        assert temporal_method.full_name == "TestClass._compute_temporal_alignment"
+    # Verify no truncated names
+    truncated_names = [name for name in method_names if name.endswith("(") or "\n" in name]
+    assert len(truncated_names) == 0, f"Found truncated method names: {truncated_names}"
 
-    Path(f.name).unlink()
+    # Verify full names are correct
+    temporal_method = next(c for c in methods if c.name == "_compute_temporal_alignment")
+    assert temporal_method.full_name == "TestClass._compute_temporal_alignment"
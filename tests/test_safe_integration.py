@@ -9,17 +9,12 @@ codebase without causing any syntax corruption.
 
 import ast
 import shutil
-
-# Import the safe modifier
-import sys
 import tempfile
 from pathlib import Path
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from uzpy.analyzer import ModernHybridAnalyzer
+from tests.helpers import python_files
 from uzpy.modifier.safe_modifier import SafeLibCSTModifier
 from uzpy.parser import TreeSitterParser
 from uzpy.types import Construct, ConstructType, Reference
@@ -37,30 +32,36 @@ class TestSafeIntegration:
             # Copy uzpy source
             src_path = Path(__file__).parent.parent / "src/uzpy"
             dest_path = temp_path / "uzpy"
-            shutil.copytree(src_path, dest_path)
+            shutil.copytree(src_path, dest_path, ignore=shutil.ignore_patterns("__pycache__"))
 
             yield dest_path
 
-    def validate_all_files(self, directory: Path) -> list[tuple[Path, str]]:
+    def validate_all_files(self, directory: Path, sources: dict[Path, bytes] | None = None) -> list[tuple[Path, str]]:
         """
         Validate all Python files in a directory.
 
+        Args:
+            directory: Directory whose Python files are read and checked
+            sources: Already-read file contents to check instead of reading the directory
+
         Returns:
             List of (file_path, error_message) tuples for files with errors
         """
         errors = []
 
-        for py_file in directory.rglob("*.py"):
-            if "__pycache__" in str(py_file):
-                continue
+        if sources is None:
+            sources = {}
+            for py_file in python_files(directory):
+                try:
+                    sources[py_file] = py_file.read_bytes()
+                except OSError as e:
+                    errors.append((py_file, f"Read error: {e}"))
 
+        for py_file, source in sources.items():
             try:
-                code = py_file.read_text()
-                ast.parse(code)
-            except SyntaxError as e:
+                ast.parse(source, filename=str(py_file))
+            except (SyntaxError, ValueError) as e:
                 errors.append((py_file, str(e)))
-            except Exception as e:
-                errors.append((py_file, f"Read error: {e}"))
 
         return errors
 
@@ -68,25 +69,25 @@ class TestSafeIntegration:
     @pytest.mark.integration
     def test_safe_modifier_on_uzpy_source(self, temp_uzpy_copy):
         """Test that the safe modifier can process uzpy source without corruption."""
+        # Read every file once; the bytes feed both validation and parsing
+        py_files = list(python_files(temp_uzpy_copy))
+        sources = {py_file: py_file.read_bytes() for py_file in py_files}
+
         # Validate source before modification
-        errors_before = self.validate_all_files(temp_uzpy_copy)
+        errors_before = self.validate_all_files(temp_uzpy_copy, sources)
         assert not errors_before, f"Source has errors before modification: {errors_before}"
 
         # Set up components
         project_root = temp_uzpy_copy.parent
         parser = TreeSitterParser()
-        ModernHybridAnalyzer(project_root)
         modifier = SafeLibCSTModifier(project_root)
 
         # Parse all Python files
         all_constructs = []
-        py_files = list(temp_uzpy_copy.rglob("*.py"))
 
-        for py_file in py_files:
-            if "__pycache__" in str(py_file):
-                continue
+        for py_file, source in sources.items():
             try:
-                constructs = parser.parse_file(py_file)
+                constructs = parser.parse_bytes(source, py_file)
                 all_constructs.extend(constructs)
             except Exception as e:
                 pytest.fail(f"Failed to parse {py_file}: {e}")
@@ -108,18 +109,8 @@ class TestSafeIntegration:
                 usage_map[construct] = refs
 
         # Modify files with safe modifier
-        modified_count = 0
-        for py_file in py_files:
-            if "__pycache__" in str(py_file):
-                continue
-
-            # Filter usage map for this file
-            file_usage_map = {c: refs for c, refs in usage_map.items() if c.file_path == py_file}
-
-            if file_usage_map:
-                success = modifier.modify_file(py_file, file_usage_map, dry_run=False, backup=True)
-                if success:
-                    modified_count += 1
+        results = modifier.modify_files(usage_map, dry_run=False, backup=True)
+        modified_count = sum(results.values())
 
         # Validate all files after modification
         errors_after = self.validate_all_files(temp_uzpy_copy)
@@ -132,9 +123,9 @@ class TestSafeIntegration:
         assert modified_count > 0, "Should have modified at least some files"
         print(f"Successfully modified {modified_count} files without corruption")
 
-    def test_safe_modifier_edge_cases(self):
+    def test_safe_modifier_edge_cases(self, tmp_path):
         """Test the safe modifier with specific edge cases."""
-        modifier = SafeLibCSTModifier(Path.cwd())
+        modifier = SafeLibCSTModifier(tmp_path)
 
         # Test case: docstring with triple quotes
         test_code = '''
@@ -143,36 +134,28 @@ def example():
     pass
 '''
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as tmp:
-            tmp.write(test_code)
-            tmp_path = Path(tmp.name)
+        file_path = tmp_path / "example.py"
+        file_path.write_text(test_code)
+
+        # Create mock usage
+        construct = Construct(
+            name="example",
+            type=ConstructType.FUNCTION,
+            file_path=file_path,
+            line_number=2,
+            docstring=None,
+            full_name="example",
+        )
+        usage_map = {construct: [Reference(tmp_path / "other.py", 10)]}
+
+        # Modify with safe modifier
+        success = modifier.modify_file(file_path, usage_map, dry_run=False, backup=True)
 
+        assert success, "Safe modifier should handle edge cases"
+
+        # Verify syntax is valid
+        modified_code = file_path.read_text()
         try:
-            # Create mock usage
-            construct = Construct(
-                name="example",
-                type=ConstructType.FUNCTION,
-                file_path=tmp_path,
-                line_number=2,
-                docstring=None,
-                full_name="example",
-            )
-            usage_map = {construct: [Reference(Path("other.py"), 10)]}
-
-            # Modify with safe modifier
-            success = modifier.modify_file(tmp_path, usage_map, dry_run=False, backup=True)
-
-            assert success, "Safe modifier should handle edge cases"
-
-            # Verify syntax is valid
-            modified_code = tmp_path.read_text()
-            try:
-                ast.parse(modified_code)
-            except SyntaxError:
-                pytest.fail(f"Modified code has syntax error:\n{modified_code}")
-
-        finally:
-            # Cleanup
-            tmp_path.unlink(missing_ok=True)
-            backup_path = tmp_path.with_suffix(".py.bak")
-            backup_path.unlink(missing_ok=True)
+            ast.parse(modified_code)
+        except SyntaxError:
+            pytest.fail(f"Modified code has syntax error:\n{modified_code}")
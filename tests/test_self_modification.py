@@ -14,6 +14,23 @@ from pathlib import Path
 
 import pytest
 
+from tests.helpers import python_files
+
+# Docstring shapes that the modifier must keep parseable, with whether each is valid
+_DOCSTRING_CASES = [
+    pytest.param('def f():\n    """Normal docstring."""\n    pass', True, id="normal"),
+    pytest.param('def f():\n    """Has \'single\' quotes."""\n    pass', True, id="single-quotes"),
+    pytest.param('def f():\n    """Has "double" quotes."""\n    pass', True, id="double-quotes"),
+    pytest.param('def f():\n    """Has \\"escaped\\" quotes."""\n    pass', True, id="escaped-quotes"),
+    pytest.param('def f():\n    "Single line"\n    pass', True, id="single-line"),
+    pytest.param('def f():\n    """\n    Multi\n    line\n    """\n    pass', True, id="multi-line"),
+    pytest.param(
+        'def f():\n    """\n    Example:\n        >>> print("test")\n        test\n    """\n    pass',
+        True,
+        id="code-example",
+    ),
+]
+
 
 class TestSelfModification:
     """Integration tests for uzpy self-modification safety."""
@@ -26,7 +43,7 @@ class TestSelfModification:
         """
         try:
             code = file_path.read_text()
-            ast.parse(code)
+            ast.parse(code, filename=str(file_path))
             return True, ""
         except SyntaxError as e:
             return False, f"SyntaxError in {file_path}: {e}"
@@ -40,9 +57,7 @@ class TestSelfModification:
             List of error messages (empty if all files are valid)
         """
         errors = []
-        for py_file in directory.rglob("*.py"):
-            if "__pycache__" in str(py_file):
-                continue
+        for py_file in python_files(directory):
             is_valid, error_msg = self.verify_python_syntax(py_file)
             if not is_valid:
                 errors.append(error_msg)
@@ -58,7 +73,7 @@ class TestSelfModification:
             # Copy uzpy source files
             src_path = Path(__file__).parent.parent / "src/uzpy"
             dest_path = temp_path / "uzpy_copy"
-            shutil.copytree(src_path, dest_path)
+            shutil.copytree(src_path, dest_path, ignore=shutil.ignore_patterns("__pycache__"))
 
             # Verify all files have valid syntax before modification
             errors_before = self.check_directory_syntax(dest_path)
@@ -93,30 +108,13 @@ class TestSelfModification:
                 # files that embed triple quotes inside string literals, which is
                 # exactly what the docstring modifier does.
 
-    def test_docstring_patterns(self):
+    @pytest.mark.parametrize(("code", "should_be_valid"), _DOCSTRING_CASES)
+    def test_docstring_patterns(self, code, should_be_valid):
         """Test various docstring patterns that might cause corruption."""
-        test_cases = [
-            # Normal docstring
-            ('def f():\n    """Normal docstring."""\n    pass', True),
-            # Docstring with single quotes
-            ('def f():\n    """Has \'single\' quotes."""\n    pass', True),
-            # Docstring with double quotes
-            ('def f():\n    """Has "double" quotes."""\n    pass', True),
-            # Docstring with escaped quotes
-            ('def f():\n    """Has \\"escaped\\" quotes."""\n    pass', True),
-            # Single-line docstring
-            ('def f():\n    "Single line"\n    pass', True),
-            # Multi-line docstring
-            ('def f():\n    """\n    Multi\n    line\n    """\n    pass', True),
-            # Docstring with code example
-            ('def f():\n    """\n    Example:\n        >>> print("test")\n        test\n    """\n    pass', True),
-        ]
-
-        for code, should_be_valid in test_cases:
-            try:
-                ast.parse(code)
-                is_valid = True
-            except SyntaxError:
-                is_valid = False
+        try:
+            ast.parse(code)
+            is_valid = True
+        except SyntaxError:
+            is_valid = False
 
-            assert is_valid == should_be_valid, f"Unexpected result for: {code!r}"
+        assert is_valid == should_be_valid, f"Unexpected result for: {code!r}"
@@ -0,0 +1,154 @@
+# this_file: tests/test_watcher.py
+
+"""
+Tests for the file system watcher's event filtering and debouncing.
+
+Synthetic watchdog events are fed straight into UzpyWatcher, so no
+observer thread or real file system activity is involved.
+"""
+
+import threading
+import time
+
+import pytest
+from watchdog.events import FileCreatedEvent, FileModifiedEvent, FileMovedEvent
+
+from uzpy.watcher import UzpyWatcher
+
+
+class _Recorder:
+    """Collects the batches handed to the watcher callback."""
+
+    def __init__(self):
+        self.batches = []
+        self.times = []
+        self._cv = threading.Condition()
+
+    def __call__(self, changed_files):
+        with self._cv:
+            self.batches.append(changed_files)
+            self.times.append(time.monotonic())
+            self._cv.notify_all()
+
+    def wait_for(self, count, timeout=2.0):
+        """Wait until at least `count` batches arrived; return whether they did."""
+        with self._cv:
+            return self._cv.wait_for(lambda: len(self.batches) >= count, timeout=timeout)
+
+
+@pytest.fixture
+def root(tmp_path):
+    """Resolved watch root, matching the paths the watcher reports."""
+    return tmp_path.resolve()
+
+
+@pytest.fixture
+def make_watcher(root):
+    """Build UzpyWatchers on `root` that are closed at teardown."""
+    watchers = []
+
+    def factory(recorder, **kwargs):
+        kwargs.setdefault("exclude_patterns", [])
+        watcher = UzpyWatcher(recorder, [root], **kwargs)
+        watchers.append(watcher)
+        return watcher
+
+    yield factory
+    for watcher in watchers:
+        watcher.close()
+
+
+def test_first_change_fires_immediately(root, make_watcher):
+    """Test that a change after a quiet period is reported without waiting for the debounce interval."""
+    recorder = _Recorder()
+    watcher = make_watcher(recorder, debounce_interval=5.0)
+
+    started = time.monotonic()
+    watcher.on_modified(FileModifiedEvent(str(root / "a.py")))
+
+    assert recorder.wait_for(1)
+    assert recorder.times[0] - started < 1.0
+    assert recorder.batches == [{root / "a.py"}]
+
+
+def test_later_changes_are_coalesced(root, make_watcher):
+    """Test that changes following a flush are debounced into a single batch."""
+    recorder = _Recorder()
+    watcher = make_watcher(recorder, debounce_interval=0.3)
+
+    watcher.on_modified(FileModifiedEvent(str(root / "a.py")))
+    assert recorder.wait_for(1)
+
+    watcher.on_modified(FileModifiedEvent(str(root / "b.py")))
+    watcher.on_created(FileCreatedEvent(str(root / "c.py")))
+    watcher.on_modified(FileModifiedEvent(str(root / "b.py")))
+
+    assert recorder.wait_for(2)
+    time.sleep(0.5)
+    assert recorder.batches[1:] == [{root / "b.py", root / "c.py"}]
+
+
+def test_continuous_stream_is_flushed_by_max_batch_window(root, make_watcher):
+    """Test that a burst longer than max_batch_window cannot hold back the callback."""
+    recorder = _Recorder()
+    watcher = make_watcher(recorder, debounce_interval=0.3, max_batch_window=0.5)
+
+    watcher.on_modified(FileModifiedEvent(str(root / "a.py")))
+    assert recorder.wait_for(1)
+
+    # Changes every 50 ms never leave a 0.3 s quiet period
+    stream_started = time.monotonic()
+    while time.monotonic() - stream_started < 1.5:
+        watcher.on_modified(FileModifiedEvent(str(root / "b.py")))
+        time.sleep(0.05)
+    stream_ended = time.monotonic()
+
+    assert recorder.wait_for(2)
+    assert recorder.times[1] < stream_ended
+
+
+def test_move_reports_both_sides(root, make_watcher):
+    """Test that a move queues both the source and the destination."""
+    recorder = _Recorder()
+    watcher = make_watcher(recorder)
+
+    watcher.on_moved(FileMovedEvent(str(root / "old.py"), str(root / "new.py")))
+
+    assert recorder.wait_for(1)
+    assert recorder.batches == [{root / "old.py", root / "new.py"}]
+
+
+def test_irrelevant_paths_are_dropped(root, tmp_path_factory, make_watcher):
+    """Test that non-Python, excluded and outside paths never reach the callback."""
+    recorder = _Recorder()
+    watcher = make_watcher(recorder, exclude_patterns=["skip_*.py"], debounce_interval=0.1)
+    outside = tmp_path_factory.mktemp("outside").resolve()
+
+    for path in (
+        root / "notes.txt",
+        root / "skip_me.py",
+        root / "__pycache__" / "cached.py",
+        outside / "elsewhere.py",
+    ):
+        watcher.on_modified(FileModifiedEvent(str(path)))
+    watcher.on_modified(FileModifiedEvent(str(root / "kept.py")))
+
+    assert recorder.wait_for(1)
+    time.sleep(0.3)
+    assert recorder.batches == [{root / "kept.py"}]
+
+
+def test_close_stops_thread_without_flushing(root, make_watcher):
+    """Test that close() stops the debounce thread and drops pending changes."""
+    recorder = _Recorder()
+    watcher = make_watcher(recorder, debounce_interval=0.3)
+
+    watcher.on_modified(FileModifiedEvent(str(root / "a.py")))
+    assert recorder.wait_for(1)
+
+    # Queued inside the debounce interval, so it is still pending when closing
+    watcher.on_modified(FileModifiedEvent(str(root / "b.py")))
+    watcher.close()
+
+    assert not watcher._debounce_thread.is_alive()
+    assert not recorder.wait_for(2, timeout=0.6)